@@ -41,6 +41,11 @@ class DrillResult(TypedDict):
     situation: List[str]
     source: str
 
+# Batched search results, grouped by the query that matched best
+class DrillQueryResults(TypedDict):
+    query: str
+    drills: List[DrillResult]
+
 # === Resource: Schema ===
 @mcp.resource("schema://drills", title="Drill Metadata Schema")
 def get_drill_schema() -> str:
@@ -63,8 +68,9 @@ def get_drill_schema() -> str:
 }"""
 
 # === Tool: Search drills in chroma vector DB ===
-from .chroma_utils import get_chroma_collection
-collection = get_chroma_collection()
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from mcp_server.off_ice.chroma_utils import query_corpora, route
 
 def parse_list(value: str) -> list[str]:
     if not value:
@@ -74,23 +80,53 @@ def parse_list(value: str) -> list[str]:
 @mcp.tool(title="Search Drills via Chroma")
 def semantic_search_drills(query: str, n_results: int = 5) -> list[DrillResult]:
     """Search for drills using semantic similarity (via vector DB)"""
-    results = collection.query(query_texts=[query], n_results=n_results)
-    docs = results.get("documents", [[]])[0]
+    results = query_corpora(route("semantic_search_drills"), [query], n_results)
     metas = results.get("metadatas", [[]])[0]
 
     print("🔍 Chroma query returned:", results)
 
-    return [
-        {
-            "title": meta.get("title", ""),
-            "hockey_skills": parse_list(meta.get("hockey_skills", "")),
-            "position": parse_list(meta.get("position", "")),
-            "situation": parse_list(meta.get("situation", "")),
-            "source": meta.get("source", ""),
-            "link": meta.get("link", ""),
-        }
-        for meta in metas
-    ]
+    return [drill_result(meta) for meta in metas]
+
+
+def drill_result(meta: dict) -> DrillResult:
+    return {
+        "title": meta.get("title", ""),
+        "hockey_skills": parse_list(meta.get("hockey_skills", "")),
+        "position": parse_list(meta.get("position", "")),
+        "situation": parse_list(meta.get("situation", "")),
+        "source": meta.get("source", ""),
+        "link": meta.get("link", ""),
+    }
+
+
+@mcp.tool(title="Batch Search Drills via Chroma")
+def semantic_search_drills_batch(queries: list[str], n_results: int = 5) -> list[DrillQueryResults]:
+    """Search for drills with several queries in one round trip.
+
+    All queries are embedded once and searched in a single Chroma call. Results are
+    grouped per query and de-duplicated: a drill matched by more than one query
+    is listed only under the query where it ranked closest.
+    """
+    queries = [q for q in dict.fromkeys(q.strip() for q in queries) if q]
+    if not queries:
+        return []
+    results = query_corpora(route("semantic_search_drills_batch"), queries, n_results)
+    ids = results.get("ids") or [[] for _ in queries]
+    metas = results.get("metadatas") or [[] for _ in queries]
+    dists = results.get("distances") or [[0.0] * len(i) for i in ids]
+
+    best: dict[str, tuple[float, int, int]] = {}
+    for q_idx, (q_ids, q_dists) in enumerate(zip(ids, dists)):
+        for rank, (doc_id, dist) in enumerate(zip(q_ids, q_dists)):
+            if doc_id not in best or dist < best[doc_id][0]:
+                best[doc_id] = (dist, q_idx, rank)
+
+    grouped: list[DrillQueryResults] = [{"query": q, "drills": []} for q in queries]
+    for doc_id, (_, q_idx, rank) in sorted(best.items(), key=lambda kv: kv[1]):
+        grouped[q_idx]["drills"].append(drill_result(metas[q_idx][rank]))
+
+    print(f"🔍 Batch Chroma query for {len(queries)} queries returned {len(best)} unique drills")
+    return grouped
 
 
 if __name__ == "__main__":
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 import json
+import sys
+import threading
+from collections import defaultdict
 from pathlib import Path
-from typing import List, TypedDict
+from typing import Dict, List, Set, Tuple, TypedDict
 
 from mcp.server.fastmcp import FastMCP
 
-from .chroma_utils import get_client, _embed
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from mcp_server.off_ice.chroma_utils import query_corpora, route
 
 mcp = FastMCP("Thunder LTAD")
 
@@ -25,34 +29,105 @@ class LTADSkill(TypedDict):
     source: str
 
 
-def _load_data() -> List[LTADSkill]:
-    if not LTAD_PATH.exists():
-        return []
-    with open(LTAD_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+# (mtime, skills, index by field -> value -> row positions)
+Snapshot = Tuple[float | None, List[LTADSkill], Dict[str, Dict[str, Set[int]]]]
+
+
+class LTADStore:
+    """In-memory LTAD skills with inverted indexes for filtered lookups.
+
+    The JSON file is parsed once and re-read only when its mtime changes.
+    Each indexed field maps a lower-cased value to the set of row positions
+    holding it, so combined filters are answered by intersecting sets.
+    Rows, index and mtime are published together as one tuple, so a query
+    never pairs new rows with an old index.
+    """
+
+    INDEXED_FIELDS = ("age_groups", "position", "skill_category", "ltad_stage", "season_month")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        # (mtime, skills, index), replaced wholesale on reload
+        self._snapshot: Snapshot = (None, [], {})
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> Snapshot:
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            snapshot = self._snapshot = (None, [], {})
+            return snapshot
+        snapshot = self._snapshot
+        if mtime == snapshot[0]:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if mtime == snapshot[0]:
+                return snapshot
+            with open(self.path, "r", encoding="utf-8") as f:
+                skills: List[LTADSkill] = json.load(f)
+            index: Dict[str, Dict[str, Set[int]]] = {f: defaultdict(set) for f in self.INDEXED_FIELDS}
+            for i, skill in enumerate(skills):
+                for field in self.INDEXED_FIELDS:
+                    value = skill.get(field)
+                    values = value if isinstance(value, list) else [value]
+                    for v in values:
+                        if v:
+                            index[field][str(v).lower()].add(i)
+            snapshot = self._snapshot = (mtime, skills, index)
+            return snapshot
+
+    def query(self, **filters: str | None) -> List[LTADSkill]:
+        """Return skills matching every non-empty filter (case-insensitive)."""
+        _, skills, index = self._refresh()
+        matches: Set[int] | None = None
+        for field, value in filters.items():
+            if not value:
+                continue
+            rows = index.get(field, {}).get(value.lower(), set())
+            matches = set(rows) if matches is None else matches & rows
+            if not matches:
+                return []
+        if matches is None:
+            return list(skills)
+        return [skills[i] for i in sorted(matches)]
+
+
+_store = LTADStore(LTAD_PATH)
 
 
 @mcp.tool("get_skills_by_age")
 def get_skills_by_age(age_group: str) -> List[LTADSkill]:
     """Return LTAD skills for a specific age group."""
-    data = _load_data()
-    return [s for s in data if age_group in s.get("age_groups", [])]
+    return _store.query(age_groups=age_group)
 
 
 @mcp.tool("get_skills_by_position")
 def get_skills_by_position(position: str) -> List[LTADSkill]:
     """Return LTAD skills for a given position."""
-    pos = position.lower()
-    data = _load_data()
-    return [s for s in data if any(pos == p.lower() for p in s.get("position", []))]
-
-
-client = get_client()
-ltad_collection = client.get_or_create_collection("ltad_index", embedding_function=_embed)
+    return _store.query(position=position)
+
+
+@mcp.tool("get_skills")
+def get_skills(
+    age_group: str | None = None,
+    position: str | None = None,
+    skill_category: str | None = None,
+    ltad_stage: str | None = None,
+    season_month: str | None = None,
+) -> List[LTADSkill]:
+    """Return LTAD skills matching all of the given filters."""
+    return _store.query(
+        age_groups=age_group,
+        position=position,
+        skill_category=skill_category,
+        ltad_stage=ltad_stage,
+        season_month=season_month,
+    )
 
 
 @mcp.tool("search_ltad_knowledge")
 def search_ltad_knowledge(query: str, n_results: int = 5) -> List[LTADSkill]:
     """Semantic search over the LTAD knowledge base."""
-    results = ltad_collection.query(query_texts=[query], n_results=n_results)
+    results = query_corpora(route("search_ltad_knowledge"), [query], n_results)
     return results.get("metadatas", [[]])[0]
@@ -2,8 +2,15 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Optional
 
 from pydantic import BaseModel
@@ -17,6 +24,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DEBUG = os.getenv("DEBUG", "false").lower() in {"1", "true", "yes"}
+YOUTUBE_CACHE_PATH = Path(
+    os.getenv(
+        "YOUTUBE_CACHE_PATH",
+        Path(__file__).resolve().parent.parent.parent / "data" / "cache" / "youtube_api.sqlite",
+    )
+)
+YOUTUBE_CACHE_TTL = int(os.getenv("YOUTUBE_CACHE_TTL", str(24 * 3600)))
 
 
 class VideoResult(BaseModel):
@@ -30,12 +44,92 @@ class VideoResult(BaseModel):
     published_at: Optional[str] | None = None
 
 
+_local = threading.local()
+
+
 def _get_client():
-    api_key = os.getenv("YOUTUBE_API_KEY")
-    print(f"🔑 Using YouTube API key: {api_key}")
-    if not api_key:
-        raise RuntimeError("YOUTUBE_API_KEY environment variable not set")
-    return build("youtube", "v3", developerKey=api_key)
+    """Return this thread's YouTube client, building it on first use.
+
+    Discovery-document building is slow and the underlying HTTP object is not
+    thread-safe, so each thread keeps one client for the life of the process.
+    """
+    youtube = getattr(_local, "youtube", None)
+    if youtube is None:
+        api_key = os.getenv("YOUTUBE_API_KEY")
+        if not api_key:
+            raise RuntimeError("YOUTUBE_API_KEY environment variable not set")
+        youtube = build("youtube", "v3", developerKey=api_key, cache_discovery=False)
+        _local.youtube = youtube
+    return youtube
+
+
+class _ResponseCache:
+    """TTL cache of YouTube API responses persisted to SQLite."""
+
+    def __init__(self, path: Path, ttl: int) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, body TEXT NOT NULL, fetched REAL NOT NULL)"
+            )
+        return self._conn
+
+    @staticmethod
+    def key(endpoint: str, params: dict) -> str:
+        raw = json.dumps([endpoint, params], sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        try:
+            with self._lock:
+                row = self._db().execute(
+                    "SELECT body, fetched FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row or time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def put(self, key: str, body: dict) -> None:
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, body, fetched) VALUES (?, ?, ?)",
+                    (key, json.dumps(body), time.time()),
+                )
+                db.execute(
+                    "DELETE FROM responses WHERE fetched < ?", (time.time() - self.ttl,)
+                )
+                db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not write YouTube response cache: {e}")
+
+
+_cache = _ResponseCache(YOUTUBE_CACHE_PATH, YOUTUBE_CACHE_TTL)
+
+
+def _api_list(endpoint: str, **params) -> dict:
+    """Call ``youtube.<endpoint>().list(**params)`` through the response cache."""
+    key = _cache.key(endpoint, params)
+    cached = _cache.get(key)
+    if cached is not None:
+        if DEBUG:
+            print(f"💾 YouTube cache hit for {endpoint} {params}")
+        return cached
+    resource = getattr(_get_client(), endpoint)()
+    resp = resource.list(**params).execute()
+    _cache.put(key, resp)
+    return resp
 
 
 def _soften_query(query: str) -> str:
@@ -53,8 +147,6 @@ def _youtube_search(
 ) -> List[VideoResult]:
     """Return a list of YouTube videos matching the search query."""
 
-    youtube = _get_client()
-
     search_kwargs = {
         "part": "id",
         "q": query,
@@ -68,13 +160,11 @@ def _youtube_search(
         search_kwargs["videoCategoryId"] = videoCategoryId
 
     def _execute_search(**kwargs) -> List[VideoResult]:
-        resp = youtube.search().list(**kwargs).execute()
+        resp = _api_list("search", **kwargs)
         ids = [item["id"]["videoId"] for item in resp.get("items", [])]
         if not ids:
             return []
-        video_resp = (
-            youtube.videos().list(part="snippet,statistics", id=",".join(ids)).execute()
-        )
+        video_resp = _api_list("videos", part="snippet,statistics", id=",".join(ids))
         results: List[VideoResult] = []
         for item in video_resp.get("items", []):
             snippet = item.get("snippet", {})
@@ -108,9 +198,10 @@ def _youtube_search(
     if not results:
         # last resort: search only videos in last year
         search_kwargs["q"] = query
+        # Truncate to the day so the cache key stays stable within a day
         search_kwargs["publishedAfter"] = (
             datetime.utcnow() - timedelta(days=365)
-        ).isoformat("T") + "Z"
+        ).strftime("%Y-%m-%dT00:00:00Z")
         results = _execute_search(**search_kwargs)
         if DEBUG:
             print(
@@ -120,9 +211,9 @@ def _youtube_search(
     return results
 
 
+@lru_cache(maxsize=256)
 def _resolve_channel_id(channel: str) -> str:
-    """Return channel ID from handle or URL."""
-    youtube = _get_client()
+    """Return channel ID from handle or URL (memoized per process)."""
     if channel.startswith("UC"):
         return channel
     if channel.startswith("http"):
@@ -142,19 +233,11 @@ def _resolve_channel_id(channel: str) -> str:
             pass
     if channel.startswith("@"):  # handle
         handle = channel.lstrip("@")
-        resp = (
-            youtube.search()
-            .list(q=handle, type="channel", part="snippet", maxResults=1)
-            .execute()
-        )
+        resp = _api_list("search", q=handle, type="channel", part="snippet", maxResults=1)
         items = resp.get("items", [])
         if items:
             return items[0]["snippet"]["channelId"]
-    resp = (
-        youtube.search()
-        .list(q=channel, type="channel", part="snippet", maxResults=1)
-        .execute()
-    )
+    resp = _api_list("search", q=channel, type="channel", part="snippet", maxResults=1)
     items = resp.get("items", [])
     if not items:
         raise ValueError(f"Unable to resolve channel id for {channel}")
@@ -168,7 +251,6 @@ def _fetch_channel_videos(
     keywords: List[str] | None = None,
 ) -> List[VideoResult]:
     """Return videos from a channel using the YouTube Data API."""
-    youtube = _get_client()
     channel_id = _resolve_channel_id(channel)
 
     order = None
@@ -191,14 +273,12 @@ def _fetch_channel_videos(
     while True:
         if next_page:
             search_kwargs["pageToken"] = next_page
-        resp = youtube.search().list(**search_kwargs).execute()
+        resp = _api_list("search", **search_kwargs)
         ids = [it["id"]["videoId"] for it in resp.get("items", [])]
         if not ids:
             break
 
-        vid_resp = (
-            youtube.videos().list(part="snippet,statistics", id=",".join(ids)).execute()
-        )
+        vid_resp = _api_list("videos", part="snippet,statistics", id=",".join(ids))
         for item in vid_resp.get("items", []):
             snippet = item.get("snippet", {})
             stats = item.get("statistics", {})
@@ -231,18 +311,11 @@ def _fetch_channel_videos(
     return videos
 
 
-def get_video_metadata(video_id: str) -> VideoResult:
-    """Fetch metadata for a single video."""
-    youtube = _get_client()
-    resp = youtube.videos().list(part="snippet,statistics", id=video_id).execute()
-    items = resp.get("items", [])
-    if not items:
-        raise ValueError(f"No video found for id {video_id}")
-    item = items[0]
+def _video_result(item: dict) -> VideoResult:
     snippet = item.get("snippet", {})
     stats = item.get("statistics", {})
     return VideoResult(
-        url=f"https://www.youtube.com/watch?v={video_id}",
+        url=f"https://www.youtube.com/watch?v={item['id']}",
         title=snippet.get("title"),
         author=snippet.get("channelTitle"),
         channel=snippet.get("channelTitle"),
@@ -250,6 +323,32 @@ def get_video_metadata(video_id: str) -> VideoResult:
         published_at=snippet.get("publishedAt"),
     )
 
+
+def get_video_metadata(video_id: str) -> VideoResult:
+    """Fetch metadata for a single video."""
+    resp = _api_list("videos", part="snippet,statistics", id=video_id)
+    items = resp.get("items", [])
+    if not items:
+        raise ValueError(f"No video found for id {video_id}")
+    return _video_result(items[0])
+
+
+def get_videos_metadata(video_ids: List[str]) -> dict[str, VideoResult]:
+    """Fetch metadata for many videos, 50 IDs per ``videos.list`` request.
+
+    Returns a mapping of video ID to metadata; unknown IDs are omitted.
+    """
+    unique = list(dict.fromkeys(v for v in video_ids if v))
+    results: dict[str, VideoResult] = {}
+    for start in range(0, len(unique), 50):
+        batch = unique[start : start + 50]
+        resp = _api_list("videos", part="snippet,statistics", id=",".join(batch))
+        for item in resp.get("items", []):
+            results[item["id"]] = _video_result(item)
+    if DEBUG:
+        print(f"📺 Resolved metadata for {len(results)}/{len(unique)} videos")
+    return results
+
 @mcp.tool(title="Search YouTube Videos")
 def search_youtube_videos(query: str, max_results: int = 5) -> List[VideoResult]:
     """Search YouTube videos."""
@@ -1,10 +1,19 @@
 # chroma_utils.py
 import os
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Iterator
 import logging
+import numpy as np
 import chromadb
 from chromadb.api import ClientAPI
-from chromadb.api.types import Documents, Embeddings, IDs, Metadatas
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings, IDs, Metadatas
 from chromadb.config import Settings
 from chromadb.utils.embedding_functions import OpenAIEmbeddingFunction
 
@@ -12,11 +21,195 @@ from dotenv import load_dotenv
 load_dotenv()
 
 COLLECTION_NAME = "hockey_drills"
-_embed = OpenAIEmbeddingFunction(api_key=os.getenv("OPENAI_API_KEY"))
+
+# Each corpus lives in its own collection so ANN searches only scan relevant
+# vectors. Keys match the ``type`` metadata written by the indexers.
+CORPUS_COLLECTIONS = {
+    "drill": COLLECTION_NAME,
+    "off_ice_training": "off_ice_manual",
+    "off_ice_video": "dryland_videos",
+    "video": "video_clips",
+    "ltad": "ltad_index",
+    "conduct_policy": "conduct_policies",
+    "nhl_insight": "nhl_insights",
+}
+DEFAULT_CORPUS = "drill"
+
+# MCP tools and the corpora they search
+TOOL_CORPORA = {
+    "semantic_search_drills": ["drill"],
+    "semantic_search_drills_batch": ["drill"],
+    "find_dryland_drills": ["off_ice_training"],
+    "find_dryland_videos": ["off_ice_video"],
+    "search_ltad_knowledge": ["ltad"],
+}
+EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002")
+EMBEDDING_CACHE_PATH = Path(
+    os.getenv(
+        "EMBEDDING_CACHE_PATH",
+        Path(__file__).resolve().parent.parent.parent / "data" / "cache" / "embeddings.sqlite",
+    )
+)
+# OpenAI embedding request limits: tokens per input, tokens and inputs per request
+EMBEDDING_MAX_INPUT_TOKENS = int(os.getenv("EMBEDDING_MAX_INPUT_TOKENS", "8191"))
+EMBEDDING_MAX_BATCH_TOKENS = int(os.getenv("EMBEDDING_MAX_BATCH_TOKENS", "300000"))
+EMBEDDING_MAX_BATCH_ITEMS = 2048
+EMBEDDING_CACHE_MAX_ITEMS = int(os.getenv("EMBEDDING_CACHE_MAX_ITEMS", "200000"))
+EMBEDDING_CACHE_MEMORY_ITEMS = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", "5000"))
+INDEX_MANIFEST_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "index_manifests"
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Content-addressed embedding cache wrapped around another embedding function.
+
+    Embeddings are keyed on ``sha256(model + text)`` and kept in a SQLite file
+    shared by every indexer and MCP server, with a small in-memory LRU in front.
+    Only texts missing from both layers are sent to the wrapped function. The
+    disk store is trimmed back to ``max_items`` rows by least-recent access.
+    """
+
+    def __init__(
+        self,
+        inner: EmbeddingFunction,
+        model: str,
+        path: Path = EMBEDDING_CACHE_PATH,
+        max_items: int = EMBEDDING_CACHE_MAX_ITEMS,
+        memory_items: int = EMBEDDING_CACHE_MEMORY_ITEMS,
+    ) -> None:
+        self._inner = inner
+        self._model = model
+        self._path = Path(path)
+        self._max_items = max_items
+        self._memory_items = memory_items
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+
+    # -- chroma config passthrough so persisted collection configs still match
+    def name(self) -> str:  # type: ignore[override]
+        return self._inner.name()
+
+    def get_config(self) -> dict:  # type: ignore[override]
+        return self._inner.get_config()
+
+    def default_space(self):  # type: ignore[override]
+        return self._inner.default_space()
+
+    def supported_spaces(self):  # type: ignore[override]
+        return self._inner.supported_spaces()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_accessed ON embeddings(accessed)"
+            )
+        return self._conn
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self._model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_items:
+            self._memory.popitem(last=False)
+
+    def _load(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        db = self._db()
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = db.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+        if found:
+            now = time.time()
+            db.executemany(
+                "UPDATE embeddings SET accessed = ? WHERE key = ?",
+                [(now, k) for k in found],
+            )
+            db.commit()
+        return found
+
+    def _store(self, items: dict[str, np.ndarray]) -> None:
+        db = self._db()
+        now = time.time()
+        db.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector, accessed) VALUES (?, ?, ?)",
+            [(k, v.astype(np.float32).tobytes(), now) for k, v in items.items()],
+        )
+        (count,) = db.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if count > self._max_items:
+            db.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                " SELECT key FROM embeddings ORDER BY accessed ASC LIMIT ?)",
+                (count - self._max_items,),
+            )
+        db.commit()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        keys = [self._key(text) for text in input]
+        vectors: dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    vectors[key] = self._memory[key]
+            pending = [k for k in dict.fromkeys(keys) if k not in vectors]
+            if pending:
+                try:
+                    for key, vec in self._load(pending).items():
+                        vectors[key] = vec
+                        self._remember(key, vec)
+                except sqlite3.Error as e:
+                    logger.warning("Embedding cache read failed: %s", e)
+
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, input):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        with self._lock:
+            # Count each distinct text once; repeats within a call are not hits
+            self.hits += len(set(keys)) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            fresh = self._inner(list(missing.values()))
+            new_items = {
+                key: np.asarray(vec, dtype=np.float32) for key, vec in zip(missing, fresh)
+            }
+            vectors.update(new_items)
+            with self._lock:
+                for key, vec in new_items.items():
+                    self._remember(key, vec)
+                try:
+                    self._store(new_items)
+                except sqlite3.Error as e:
+                    logger.warning("Embedding cache write failed: %s", e)
+
+        return [vectors[key] for key in keys]
+
+
+_embed = CachedEmbeddingFunction(
+    OpenAIEmbeddingFunction(api_key=os.getenv("OPENAI_API_KEY"), model_name=EMBEDDING_MODEL),
+    model=EMBEDDING_MODEL,
+)
+
 def get_client() -> ClientAPI:
     host = os.getenv("CHROMA_SERVER_HOST", "localhost")
     port = int(os.getenv("CHROMA_SERVER_HTTP_PORT", "8000"))
@@ -25,49 +218,393 @@ def get_client() -> ClientAPI:
     print(f"Connecting to Chroma server at {host}:{port} with token: {bool(token)}")
     return chromadb.HttpClient(host=host, port=port, headers=headers)
 
-def get_chroma_collection():
-    client = get_client()
-    print(f"Using Chroma client: {client}")
-    collection = client.get_or_create_collection(COLLECTION_NAME, embedding_function=_embed)
-    return collection
+def route(target: str) -> list[str]:
+    """Map a tool name, corpus or ``type`` value to the corpora it searches."""
+    if target in TOOL_CORPORA:
+        return TOOL_CORPORA[target]
+    if target in CORPUS_COLLECTIONS:
+        return [target]
+    raise ValueError(f"Unknown corpus or tool: {target}")
+
+
+def collection_name(corpus: str = DEFAULT_CORPUS) -> str:
+    if corpus not in CORPUS_COLLECTIONS:
+        raise ValueError(f"Unknown corpus: {corpus}")
+    return CORPUS_COLLECTIONS[corpus]
+
+
+_client: ClientAPI | None = None
+_collections: dict[str, object] = {}
+_collections_lock = threading.Lock()
+
+
+def get_chroma_collection(corpus: str = DEFAULT_CORPUS):
+    """Return (and memoize) the collection holding ``corpus``."""
+    global _client
+    name = collection_name(corpus)
+    with _collections_lock:
+        if name not in _collections:
+            if _client is None:
+                _client = get_client()
+                print(f"Using Chroma client: {_client}")
+            _collections[name] = _client.get_or_create_collection(name, embedding_function=_embed)
+        return _collections[name]
+
+
+def query_corpora(
+    corpora: list[str],
+    query_texts: list[str],
+    n_results: int = 5,
+    where: dict | None = None,
+) -> dict:
+    """Fan a query out over several corpora and merge hits by distance.
+
+    Query texts are embedded once and the resulting vectors are sent to each
+    collection in parallel. The return value has the same shape as
+    ``collection.query`` plus a ``corpora`` list naming where each hit came from.
+    """
+    embeddings = _embed(query_texts)
+
+    def _one(corpus: str) -> tuple[str, dict]:
+        kwargs = {"query_embeddings": embeddings, "n_results": n_results}
+        if where:
+            kwargs["where"] = where
+        return corpus, get_chroma_collection(corpus).query(**kwargs)
+
+    if len(corpora) == 1:
+        partials = [_one(corpora[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(corpora)) as pool:
+            partials = list(pool.map(_one, corpora))
+
+    merged = {"ids": [], "documents": [], "metadatas": [], "distances": [], "corpora": []}
+    for q in range(len(query_texts)):
+        hits = []
+        for corpus, res in partials:
+            ids = res.get("ids", [[]])[q]
+            docs = (res.get("documents") or [[None] * len(ids)])[q]
+            metas = (res.get("metadatas") or [[None] * len(ids)])[q]
+            dists = (res.get("distances") or [[0.0] * len(ids)])[q]
+            hits.extend(zip(dists, ids, docs, metas, [corpus] * len(ids)))
+        hits.sort(key=lambda h: h[0])
+        hits = hits[:n_results]
+        merged["distances"].append([h[0] for h in hits])
+        merged["ids"].append([h[1] for h in hits])
+        merged["documents"].append([h[2] for h in hits])
+        merged["metadatas"].append([h[3] for h in hits])
+        merged["corpora"].append([h[4] for h in hits])
+    return merged
 
 def clear_chroma_collection(
     mode: str = "all",
     prefix: str | None = None,
     ids: list[str] | None = None,
+    where: dict | None = None,
+    batch_size: int = 1000,
+    corpus: str = DEFAULT_CORPUS,
 ) -> None:
-    """Delete documents from the Chroma collection.
+    """Delete documents from the collection holding ``corpus``.
 
     Modes:
         - "all": remove everything (default)
         - "type": remove docs with ID starting with ``prefix``
         - "ids": remove specific document IDs
+        - "where": remove docs matching a metadata filter, e.g. ``{"type": "off_ice_video"}``
+
+    IDs are paged from the server with ``include=[]`` and deleted in batches of
+    ``batch_size`` so memory stays bounded regardless of collection size.
     """
-    collection = get_chroma_collection()
+    collection = get_chroma_collection(corpus)
     try:
-        all_ids = collection.get().get("ids", [])
-
         if mode == "ids":
-            ids_to_delete = ids or []
+            deleted = _delete_ids(collection, ids or [], batch_size)
+        elif mode == "where":
+            if not where:
+                logger.warning("Filter required for mode='where'. No documents deleted.")
+                return
+            deleted = collection.count()
+            collection.delete(where=where)
+            deleted -= collection.count()
         elif mode == "type":
             if not prefix:
                 logger.warning("Prefix required for mode='type'. No documents deleted.")
                 return
-            ids_to_delete = [i for i in all_ids if str(i).startswith(prefix)]
+            deleted = _delete_paged(
+                collection, lambda i: str(i).startswith(prefix), batch_size
+            )
         else:  # mode == "all" or unspecified
-            ids_to_delete = all_ids
+            deleted = _delete_paged(collection, lambda i: True, batch_size)
 
-        if not ids_to_delete:
+        if not deleted:
             logger.info("No matching documents to delete from Chroma collection.")
             return
 
-        collection.delete(ids=ids_to_delete)
         logger.info(
             "🧹 Deleted %s documents from Chroma collection (%s mode)",
-            len(ids_to_delete),
+            deleted,
             mode,
         )
     except Exception as e:
         logger.error("❌ Failed to clear Chroma collection: %s", e)
 
 
+def _delete_ids(collection, ids: list[str], batch_size: int) -> int:
+    for start in range(0, len(ids), batch_size):
+        collection.delete(ids=ids[start : start + batch_size])
+    return len(ids)
+
+
+def _delete_paged(collection, match, batch_size: int) -> int:
+    """Page through IDs only and delete matches one page at a time."""
+    deleted = 0
+    offset = 0
+    while True:
+        page = collection.get(include=[], limit=batch_size, offset=offset).get("ids", [])
+        if not page:
+            break
+        doomed = [i for i in page if match(i)]
+        if doomed:
+            collection.delete(ids=doomed)
+            deleted += len(doomed)
+        # Deleted IDs shift later pages down, so only skip over what was kept
+        offset += len(page) - len(doomed)
+        if len(page) < batch_size:
+            break
+    return deleted
+
+
+def content_fingerprint(document: str, metadata: dict | None) -> str:
+    """Stable hash of a document and its metadata, used to detect changes."""
+    payload = json.dumps([document, metadata or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IndexManifest:
+    """Per-document fingerprints of what an indexer last wrote to Chroma.
+
+    One manifest covers one ``scope`` (an ID prefix such as ``drill-`` or
+    ``video-``) of a collection, so different indexers sharing a collection
+    never delete each other's documents.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.fingerprints: dict[str, str] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.fingerprints = json.load(f)
+            except Exception as e:
+                logger.warning("Ignoring unreadable index manifest %s: %s", self.path, e)
+
+    @classmethod
+    def for_scope(cls, collection_name: str, scope: str) -> "IndexManifest":
+        safe_scope = scope.strip("-_") or "all"
+        return cls(INDEX_MANIFEST_DIR / f"{collection_name}__{safe_scope}.json")
+
+    def diff(
+        self, ids: IDs, documents: Documents, metadatas: Metadatas
+    ) -> tuple[list[int], list[str]]:
+        """Return indices of new/changed documents and IDs no longer present."""
+        changed = [
+            i
+            for i, (doc_id, doc, meta) in enumerate(zip(ids, documents, metadatas))
+            if self.fingerprints.get(doc_id) != content_fingerprint(doc, meta)
+        ]
+        current = set(ids)
+        removed = [doc_id for doc_id in self.fingerprints if doc_id not in current]
+        return changed, removed
+
+    def record(self, ids: IDs, documents: Documents, metadatas: Metadatas) -> None:
+        for doc_id, doc, meta in zip(ids, documents, metadatas):
+            self.fingerprints[doc_id] = content_fingerprint(doc, meta)
+
+    def forget(self, ids: IDs) -> None:
+        for doc_id in ids:
+            self.fingerprints.pop(doc_id, None)
+
+    def clear(self) -> None:
+        self.fingerprints = {}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.fingerprints, f)
+        tmp.replace(self.path)
+
+
+def pack_batches(
+    indices: list[int],
+    sizes: list[int],
+    budget: int = EMBEDDING_MAX_BATCH_TOKENS,
+    max_items: int = EMBEDDING_MAX_BATCH_ITEMS,
+) -> list[list[int]]:
+    """Greedily group ``indices`` so each batch's ``sizes`` sum stays within ``budget``.
+
+    Order is preserved. An item larger than ``budget`` gets a batch of its own.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    used = 0
+    for i in indices:
+        if current and (used + sizes[i] > budget or len(current) >= max_items):
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += sizes[i]
+    if current:
+        batches.append(current)
+    return batches
+
+
+def upsert_batches(
+    collection,
+    ids: IDs,
+    documents: Documents,
+    metadatas: Metadatas,
+    batches: list[list[int]],
+    workers: int = 1,
+) -> Iterator[list[int]]:
+    """Upsert each batch of indices with up to ``workers`` requests in flight.
+
+    Yields the indices of every batch that was written, in completion order.
+    Failed batches are logged and skipped.
+    """
+    def _upsert(idx: list[int]) -> list[int]:
+        collection.upsert(
+            ids=[ids[i] for i in idx],
+            documents=[documents[i] for i in idx],
+            metadatas=[metadatas[i] for i in idx],
+        )
+        return idx
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(_upsert, idx): idx for idx in batches}
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logger.error("❌ Failed to upsert batch of %s starting with %s: %s", len(idx), ids[idx[0]], e)
+                continue
+            yield idx
+
+
+def existing_ids(collection, ids: IDs, batch_size: int = 1000) -> set[str]:
+    """Return which of ``ids`` are already stored in ``collection``.
+
+    Looks the IDs up in batches with ``include=[]`` so no documents,
+    metadata or embeddings are transferred, instead of listing the whole
+    collection.
+    """
+    found: set[str] = set()
+    for start in range(0, len(ids), batch_size):
+        result = collection.get(ids=list(ids[start : start + batch_size]), include=[])
+        found.update(result.get("ids") or [])
+    return found
+
+
+def bulk_ingest(
+    collection,
+    ids: IDs,
+    documents: Documents,
+    metadatas: Metadatas,
+    batch_size: int = 500,
+    workers: int = 4,
+    skip_existing: bool = True,
+) -> tuple[int, int, int]:
+    """Write documents in sized batches, skipping IDs that are already stored.
+
+    Existence is checked with :func:`existing_ids`, then the remaining
+    documents are upserted ``batch_size`` at a time with ``workers`` batches in
+    flight, so thousands of entries take a handful of requests rather than
+    one per document. Returns ``(written, skipped, failed)`` counts.
+    """
+    present = existing_ids(collection, ids) if skip_existing else set()
+    todo = [i for i, doc_id in enumerate(ids) if doc_id not in present]
+    skipped = len(ids) - len(todo)
+    batches = [todo[i : i + batch_size] for i in range(0, len(todo), batch_size)]
+    logger.info(
+        "Bulk ingest: %s to write in %s batches, %s already indexed", len(todo), len(batches), skipped
+    )
+
+    written = 0
+    for idx in upsert_batches(collection, ids, documents, metadatas, batches, workers):
+        written += len(idx)
+    return written, skipped, len(todo) - written
+
+
+def sync_collection(
+    collection,
+    ids: IDs,
+    documents: Documents,
+    metadatas: Metadatas,
+    manifest: IndexManifest,
+    batch_size: int = 100,
+    token_counts: list[int] | None = None,
+    token_budget: int = EMBEDDING_MAX_BATCH_TOKENS,
+    workers: int = 1,
+    save_every: int = 20,
+) -> tuple[int, int]:
+    """Incrementally bring ``collection`` in line with the given documents.
+
+    Only documents whose fingerprint differs from ``manifest`` are upserted and
+    only IDs that disappeared from the input are deleted. The manifest is saved
+    every ``save_every`` batches and once more on exit, even after an error,
+    so an interrupted run resumes close to where it stopped without
+    rewriting the whole manifest for each batch.
+    When ``token_counts`` is given, upsert batches are packed up to
+    ``token_budget`` tokens (and at most ``batch_size`` documents) instead of a
+    fixed document count; ``workers`` batches are sent concurrently.
+    Returns ``(upserted, deleted)`` counts.
+    """
+    if manifest.fingerprints and collection.count() == 0:
+        logger.info("Collection is empty; discarding stale manifest %s", manifest.path)
+        manifest.clear()
+
+    changed, removed = manifest.diff(ids, documents, metadatas)
+    logger.info(
+        "Incremental sync: %s new/changed, %s removed, %s unchanged",
+        len(changed),
+        len(removed),
+        len(ids) - len(changed),
+    )
+
+    if token_counts is not None:
+        batches = pack_batches(changed, token_counts, token_budget, batch_size)
+    else:
+        batches = [changed[i : i + batch_size] for i in range(0, len(changed), batch_size)]
+
+    upserted = 0
+    deleted = 0
+    unsaved = 0
+
+    def _checkpoint() -> None:
+        nonlocal unsaved
+        unsaved += 1
+        if unsaved >= save_every:
+            manifest.save()
+            unsaved = 0
+
+    try:
+        for idx in upsert_batches(collection, ids, documents, metadatas, batches, workers):
+            manifest.record(
+                [ids[i] for i in idx], [documents[i] for i in idx], [metadatas[i] for i in idx]
+            )
+            upserted += len(idx)
+            _checkpoint()
+
+        for start in range(0, len(removed), batch_size):
+            batch = removed[start : start + batch_size]
+            try:
+                collection.delete(ids=batch)
+            except Exception as e:
+                logger.error("❌ Failed to delete batch starting at %s: %s", start, e)
+                continue
+            manifest.forget(batch)
+            deleted += len(batch)
+            _checkpoint()
+    finally:
+        manifest.save()
+    return upserted, deleted
@@ -15,10 +15,9 @@ from pathlib import Path
 
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
-from chroma_utils import get_chroma_collection
+from chroma_utils import query_corpora, route
 
 mcp = FastMCP("Off-Ice KB MCP Server")
-collection = get_chroma_collection()
 client = OpenAI()
 
 from datetime_tools import get_current_date
@@ -80,11 +79,7 @@ def _parse_description(doc: str) -> str:
 
 @mcp.tool("find_dryland_drills")
 def find_dryland_drills(query: str, n_results: int = 5) -> List[OffIceResult]:
-    results = collection.query(
-        query_texts=[query],
-        n_results=n_results,
-        where={"source": "off_ice_manual_hockey_canada_level1"},
-    )
+    results = query_corpora(route("find_dryland_drills"), [query], n_results)
     docs = results.get("documents", [[]])[0]
     metas = results.get("metadatas", [[]])[0]
 
@@ -108,11 +103,7 @@ def find_dryland_drills(query: str, n_results: int = 5) -> List[OffIceResult]:
 @mcp.tool("find_dryland_videos")
 def find_dryland_videos(query: str, n_results: int = 5) -> List[VideoTitle]:
     """Semantic search over dryland video titles."""
-    results = collection.query(
-        query_texts=[query],
-        n_results=n_results,
-        where={"type": "off_ice_video"},
-    )
+    results = query_corpora(route("find_dryland_videos"), [query], n_results)
     docs = results.get("documents", [[]])[0]
     metas = results.get("metadatas", [[]])[0]
     video_results: List[dict] = []
@@ -5,38 +5,32 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Set
+from typing import List, Set, Tuple
 
-import requests
 from bs4 import BeautifulSoup
 
 # Add repo root to PYTHONPATH
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from models.mlhs_article import MLHSArticle
+from utils.article_store import ArticleStore
+from utils.polite_http import FetchResult, PoliteSession, ValidatorStore
 
 BASE_URL = "https://mapleleafshotstove.com/leafs-news/"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0 Safari/537.36"
 }
+VALIDATORS_PATH = Path("data/cache/mlhs_http_validators.json")
+# Article tiles whose download failed, retried first on the next crawl
+RETRY_PATH = Path("data/cache/mlhs_retry_articles.json")
 
 
-def _load_json_if_exists(path: Path) -> list[dict]:
-    if path.exists():
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return []
-    return []
-
-
-def fetch_page(url: str) -> BeautifulSoup:
-    resp = requests.get(url, headers=HEADERS, timeout=30)
-    resp.raise_for_status()
-    return BeautifulSoup(resp.text, "lxml")
+def listing_url(page: int) -> str:
+    return BASE_URL if page == 1 else f"{BASE_URL}page/{page}/"
 
 
 def parse_tiles(soup: BeautifulSoup) -> List[dict]:
@@ -67,56 +61,159 @@ def parse_tiles(soup: BeautifulSoup) -> List[dict]:
     return tiles
 
 
-def fetch_article_html(url: str) -> str:
-    soup = fetch_page(url)
+def extract_article_html(html: str) -> str:
+    soup = BeautifulSoup(html, "lxml")
     content_div = soup.select_one("div.td-post-content")
     return str(content_div) if content_div else ""
 
 
-def crawl(num_pages: int, existing_urls: Set[str]) -> List[MLHSArticle]:
-    articles: List[MLHSArticle] = []
-    for page in range(1, num_pages + 1):
-        page_url = BASE_URL if page == 1 else f"{BASE_URL}page/{page}/"
-        print(f"🌐 Fetching {page_url}")
-        soup = fetch_page(page_url)
-        tiles = parse_tiles(soup)
-        print(f"📝 Found {len(tiles)} articles on page {page}")
-        for t in tiles:
-            if t["url"] in existing_urls:
-                print(f"⏭️ Skipping already fetched {t['url']}")
+def build_article(tile: dict, html: str, page: int) -> MLHSArticle:
+    try:
+        date_obj = (
+            datetime.strptime(tile["published_date"], "%B %d, %Y").date()
+            if tile.get("published_date")
+            else datetime.today().date()
+        )
+    except Exception:
+        date_obj = datetime.today().date()
+    author = tile.get("author")
+    if author and author.endswith("-"):
+        author = author[:-1].strip()
+    return MLHSArticle(
+        title=tile["title"],
+        url=tile["url"],
+        author=author,
+        published_date=date_obj,
+        category=tile.get("category"),
+        excerpt=tile.get("excerpt"),
+        html_content=html,
+        page_number=page,
+    )
+
+
+def _status(exc: Exception) -> int | None:
+    return getattr(getattr(exc, "response", None), "status_code", None)
+
+
+def crawl(
+    num_pages: int,
+    existing_urls: Set[str],
+    http: PoliteSession,
+    workers: int = 8,
+    listing_window: int = 4,
+    early_stop: bool = True,
+    retry: List[dict] | None = None,
+) -> Tuple[List[MLHSArticle], List[FetchResult], List[dict]]:
+    """Crawl listing pages and fetch unseen articles concurrently.
+
+    Listing pages are fetched ``listing_window`` at a time with conditional
+    GETs and handled in page order. Article downloads for each page are
+    queued on a shared thread pool as soon as the page is parsed, so they
+    overlap with later listing fetches. With ``early_stop``, the crawl stops
+    at the first listing page that is unchanged (304) or lists only known
+    URLs, since everything older has already been fetched. A listing page
+    that fails is skipped (a 404 ends the crawl). Any failure also drops the
+    validators of page 1, so the next crawl cannot stop early before
+    retrying it. ``retry`` holds ``{"tile", "page"}`` entries of articles
+    that failed last time; they are downloaded first, since early stop would
+    otherwise never reach their listing page again.
+
+    Returns the new articles, the listing pages whose articles were all
+    fetched (their validators should be committed only once the articles
+    are stored) and the articles that failed, for the next ``retry``.
+    """
+    jobs: list[tuple[dict, int, object]] = []
+    queued: Set[str] = set()
+    listings: dict[int, FetchResult] = {}
+
+    def _listing(p: int) -> FetchResult | Exception:
+        try:
+            return http.get(listing_url(p), conditional=early_stop)
+        except Exception as e:
+            return e
+
+    def _article(url: str) -> str:
+        return extract_article_html(http.get(url).text or "")
+
+    def _forget(p: int) -> None:
+        # Refetch this listing in full next time so its articles are retried.
+        # Page 1 goes too: a 304 there would early-stop before reaching page p.
+        for page_no in {1, p}:
+            listings.pop(page_no, None)
+            if http.validators:
+                http.validators.forget(listing_url(page_no))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for entry in retry or []:
+            tile = entry["tile"]
+            if tile["url"] in existing_urls or tile["url"] in queued:
                 continue
-            html = fetch_article_html(t["url"])
+            queued.add(tile["url"])
+            jobs.append((tile, entry["page"], pool.submit(_article, tile["url"])))
+        if jobs:
+            print(f"🔁 Retrying {len(jobs)} articles that failed last crawl")
+
+        page = 1
+        stop = False
+        while page <= num_pages and not stop:
+            window = range(page, min(page + listing_window, num_pages + 1))
+            for p, result in zip(window, list(pool.map(_listing, window))):
+                if isinstance(result, Exception):
+                    _forget(p)
+                    if _status(result) == 404:
+                        print(f"⏹️ Page {p} not found; stopping")
+                        stop = True
+                        break
+                    print(f"❌ Failed to fetch listing page {p}: {result}")
+                    continue
+                if result.not_modified:
+                    print(f"⏹️ Page {p} unchanged since last crawl; stopping")
+                    stop = True
+                    break
+                listings[p] = result
+                tiles = parse_tiles(BeautifulSoup(result.text, "lxml"))
+                new = [t for t in tiles if t["url"] not in existing_urls and t["url"] not in queued]
+                print(f"📝 Found {len(tiles)} articles on page {p} ({len(new)} new)")
+                for t in new:
+                    queued.add(t["url"])
+                    jobs.append((t, p, pool.submit(_article, t["url"])))
+                if early_stop and tiles and not new:
+                    print(f"⏹️ Page {p} lists only known articles; stopping")
+                    stop = True
+                    break
+            page += listing_window
+
+        articles: List[MLHSArticle] = []
+        failed: List[dict] = []
+        for tile, p, future in jobs:
             try:
-                date_obj = (
-                    datetime.strptime(t["published_date"], "%B %d, %Y").date()
-                    if t.get("published_date")
-                    else datetime.today().date()
-                )
-            except Exception:
-                date_obj = datetime.today().date()
-            author = t.get("author")
-            if author and author.endswith("-"):
-                author = author[:-1].strip()
-            article = MLHSArticle(
-                title=t["title"],
-                url=t["url"],
-                author=author,
-                published_date=date_obj,
-                category=t.get("category"),
-                excerpt=t.get("excerpt"),
-                html_content=html,
-                page_number=page,
-            )
-            articles.append(article)
-            existing_urls.add(t["url"])
-    return articles
-
-
-def write_output(articles: List[MLHSArticle], out_path: Path) -> None:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    data = [json.loads(a.model_dump_json()) for a in articles]
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+                html = future.result()
+            except Exception as e:
+                print(f"❌ Failed to fetch {tile['url']}: {e}")
+                _forget(p)
+                failed.append({"tile": tile, "page": p})
+                continue
+            articles.append(build_article(tile, html, p))
+            existing_urls.add(tile["url"])
+    return articles, list(listings.values()), failed
+
+
+def load_retry(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_retry(path: Path, failed: List[dict]) -> None:
+    if not failed:
+        path.unlink(missing_ok=True)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(failed, f, indent=2)
+    tmp.replace(path)
 
 
 def main() -> None:
@@ -129,21 +226,60 @@ def main() -> None:
     parser.add_argument(
         "--output",
         type=Path,
-        default=Path("data/raw/mlhs_articles.json"),
-        help="Output JSON path",
+        default=Path("data/raw/mlhs_articles"),
+        help="Article store directory (a legacy mlhs_articles.json beside it is imported once)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Concurrent article downloads"
+    )
+    parser.add_argument(
+        "--max-per-host", type=int, default=6, help="Requests in flight per host"
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=10.0,
+        help="Request starts per second per host (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--no-early-stop",
+        action="store_true",
+        help="Crawl all --num-pages even when a page has no new articles (backfill)",
     )
     args = parser.parse_args()
 
-    existing_data = _load_json_if_exists(args.output)
-    existing_urls = {a.get("url") for a in existing_data}
-    articles = [MLHSArticle(**a) for a in existing_data]
+    store = ArticleStore.for_output(args.output)
+    existing_urls = store.urls()
 
-    new_articles = crawl(args.num_pages, existing_urls)
-    articles.extend(new_articles)
-    write_output(articles, args.output)
+    http = PoliteSession(
+        headers=HEADERS,
+        max_per_host=args.max_per_host,
+        requests_per_second=args.requests_per_second or None,
+        validators=ValidatorStore(VALIDATORS_PATH),
+    )
+    start = time.perf_counter()
+    try:
+        new_articles, listings, failed = crawl(
+            args.num_pages,
+            existing_urls,
+            http,
+            workers=args.workers,
+            early_stop=not args.no_early_stop,
+            retry=load_retry(RETRY_PATH),
+        )
+        added = store.append(new_articles)
+        save_retry(RETRY_PATH, failed)
+        # Only now can an unchanged listing safely short-circuit the next crawl
+        for result in listings:
+            http.validators.update(result.url, result)
+    finally:
+        http.close()
+    stats = http.stats
     print(
-        f"✅ Saved {len(new_articles)} new articles ({len(articles)} total) to {args.output}"
+        f"🌐 {stats['requests']} requests ({stats['not_modified']} not modified), "
+        f"{stats['bytes'] / 1024:.0f} KiB in {time.perf_counter() - start:.1f}s"
     )
+    print(f"✅ Saved {added} new articles ({len(store)} total) to {store.root}")
 
 
 if __name__ == "__main__":
@@ -10,20 +10,20 @@ from typing import List, Dict
 import time
 
 import re
-from difflib import SequenceMatcher
 
 from pydantic import ValidationError
 
 import fitz  # PyMuPDF
 import yaml
-from openai import OpenAI
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from models.off_ice import OffIceEntry
 from models.enriched_off_ice import EnrichedOffIceEntry
+from utils.llm import LLM
+from utils.near_duplicates import near_duplicate_clusters
 
-client = OpenAI()
+llm = LLM(model="gpt-3.5-turbo-0125")
 
 PROMPT_DIR = Path(__file__).resolve().parent.parent / "prompts"
 PROMPT_STAGE0 = PROMPT_DIR / "office_stage0_extract.yaml"
@@ -71,12 +71,8 @@ def stage0_extract_items(pages: List[tuple[int, str]]) -> List[OffIceEntry]:
         user_blocks.append(f"Page {page_no}:\n{text}")
     user = "\n".join(user_blocks) + "\n\nReturn JSON list."
 
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        temperature=0,
-        messages=[{"role": "system", "content": PROMPT}, {"role": "user", "content": user}],
-    )
-    data = _parse_json(resp.choices[0].message.content)
+    resp = llm.chat(PROMPT, user)
+    data = _parse_json(resp.content)
     if not data:
         return []
     if isinstance(data, dict):
@@ -112,35 +108,17 @@ def _norm(text: str) -> str:
     return text
 
 
-def group_similar(items: List[OffIceEntry]) -> List[List[OffIceEntry]]:
-    """Group entries with fuzzy-matched titles for merging."""
-    groups: List[List[OffIceEntry]] = []
-    used: set[int] = set()
+def group_similar(items: List[OffIceEntry], threshold: float = 0.7) -> List[List[OffIceEntry]]:
+    """Group entries with near-duplicate titles (MinHash/LSH) for merging."""
     titles = [_norm(it.title) for it in items]
-    for i, it in enumerate(items):
-        if i in used:
-            continue
-        grp = [it]
-        used.add(i)
-        for j in range(i + 1, len(items)):
-            if j in used:
-                continue
-            if SequenceMatcher(None, titles[i], titles[j]).ratio() >= 0.85:
-                grp.append(items[j])
-                used.add(j)
-        groups.append(grp)
-    return groups
+    return [[items[i] for i in cluster] for cluster in near_duplicate_clusters(titles, threshold)]
 
 
 def merge_and_enrich(group: List[OffIceEntry]) -> EnrichedOffIceEntry | None:
     """Use the LLM to merge similar entries and enrich metadata."""
     user = json.dumps([e.model_dump() for e in group], indent=2)
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        temperature=0,
-        messages=[{"role": "system", "content": PROMPT_MERGE}, {"role": "user", "content": user}],
-    )
-    data = _parse_json(resp.choices[0].message.content)
+    resp = llm.chat(PROMPT_MERGE, user)
+    data = _parse_json(resp.content)
     if isinstance(data, dict):
         # Normalize LLM output types
         if isinstance(data.get("teaching_complexity"), int):
@@ -212,6 +190,12 @@ def main() -> None:
         type=Path,
         help="Optional PDF path to re-run stage 0 extraction",
     )
+    parser.add_argument(
+        "--title-similarity",
+        type=float,
+        default=0.7,
+        help="Estimated Jaccard similarity of title 3-grams needed to group entries",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Print results only")
     args = parser.parse_args()
 
@@ -242,7 +226,7 @@ def main() -> None:
 
     print("🔁 Grouping similar entries...")
     stage_start = time.perf_counter()
-    groups = group_similar(raw_entries)
+    groups = group_similar(raw_entries, args.title_similarity)
     print(f"🔎 Created {len(groups)} groups ({time.perf_counter() - stage_start:.1f}s)")
 
     enriched: List[EnrichedOffIceEntry] = []
@@ -267,6 +251,7 @@ def main() -> None:
         print(f"⚠️ Skipped {skipped} groups due to errors")
 
     total_duration = time.perf_counter() - start_time
+    print(llm.cache.report())
     print(f"⏱️ Finished in {total_duration:.1f}s")
 
 
@@ -12,12 +12,12 @@ from typing import List, Dict, Any
 import fitz
 from bs4 import BeautifulSoup
 import yaml
-from openai import OpenAI
 
 import sys
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from models.conduct import ConductEntry
+from utils.llm import LLM
 
 PROMPT_DIR = Path(__file__).resolve().parent.parent / "prompts"
 
@@ -35,7 +35,7 @@ PROMPT_STAGE0 = (
 )
 PROMPT_STAGE1 = load_prompt("conduct_stage1_enrich.yaml")
 
-client = OpenAI()
+llm = LLM(model="gpt-3.5-turbo-0125")
 
 
 def _parse_json(content: str) -> Any:
@@ -54,12 +54,8 @@ def _parse_json(content: str) -> Any:
 def extract_batch(pages: List[tuple[int, str]], source: str) -> List[dict]:
     user_blocks = [f"Page {p}:\n{text}" for p, text in pages]
     user = "\n\n".join(user_blocks) + "\n\nReturn JSON list."
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        temperature=0,
-        messages=[{"role": "system", "content": PROMPT_STAGE0}, {"role": "user", "content": user}],
-    )
-    data = _parse_json(resp.choices[0].message.content)
+    resp = llm.chat(PROMPT_STAGE0, user)
+    data = _parse_json(resp.content)
     if not data:
         return []
     if isinstance(data, dict):
@@ -118,12 +114,8 @@ def extract_html(path: Path, chunk_words: int = 150) -> List[dict]:
 
 def enrich_batch(rows: List[dict]) -> List[dict]:
     user = json.dumps(rows, indent=2)
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        temperature=0,
-        messages=[{"role": "system", "content": PROMPT_STAGE1}, {"role": "user", "content": user}],
-    )
-    data = _parse_json(resp.choices[0].message.content)
+    resp = llm.chat(PROMPT_STAGE1, user)
+    data = _parse_json(resp.content)
     if not data:
         return []
     if isinstance(data, dict):
@@ -211,6 +203,7 @@ def main() -> None:
 
     duration = time.perf_counter() - start
     print(f"✅ Final enriched entries: {len(all_entries)}")
+    print(llm.cache.report())
     print(f"⏱️ Took {duration:.1f}s")
 
 
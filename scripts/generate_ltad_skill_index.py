@@ -1,24 +1,33 @@
 #!/usr/bin/env python3
-"""Consolidated LTAD skill extraction and post-processing pipeline."""
+"""Consolidated LTAD skill extraction and post-processing pipeline.
+
+Stages 0-2 (sections -> rows -> enriched skills) run as overlapping async
+tasks with a concurrency cap per stage, and every completed page, section and
+row is checkpointed so an interrupted run resumes where it stopped.
+"""
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
 
 import fitz
+import tiktoken
 import yaml
-from openai import OpenAI
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from models.ltad import LTADSkill
+from utils.checkpoint import CheckpointStore, content_key
+from utils.llm import LLM
+from utils.near_duplicates import near_duplicate_clusters
+from utils.rate_limit import RateLimitedRunner
 from ltad_normalizer import normalize_ltad_skill, infer_age_group_from_text
-from difflib import SequenceMatcher
 
 
 PROMPT_DIR = Path(__file__).resolve().parent.parent / "prompts"
@@ -32,10 +41,20 @@ def load_prompt(name: str) -> str:
 PROMPT_STAGE0 = load_prompt("ltad_stage0_extract.yaml")
 PROMPT_STAGE1 = load_prompt("ltad_stage1_parse_skills.yaml")
 PROMPT_STAGE2 = load_prompt("ltad_stage2_enrich_skills.yaml")
+PROMPT_STAGE2_BATCH = PROMPT_STAGE2 + "\n" + load_prompt("ltad_stage2_enrich_batch.yaml")
 PROMPT_COMPARE = load_prompt("ltad_compare_prompt.yaml")
 PROMPT_MERGE = load_prompt("ltad_merge_prompt.yaml")
 
-client = OpenAI()
+llm = LLM(model="gpt-3.5-turbo-0125")
+
+DEFAULT_CHECKPOINT = Path("data/cache/ltad_extraction.jsonl")
+
+# gpt-3.5-turbo tokenizer, used to size stage 2 batches
+_ENC = tiktoken.get_encoding("cl100k_base")
+# gpt-3.5-turbo returns at most 4096 tokens; keep batched answers well under it
+STAGE2_MAX_OUTPUT_TOKENS = 3000
+# Fixed JSON fields per enriched row, on top of the text carried over from the row
+STAGE2_ROW_OUTPUT_OVERHEAD = 120
 
 
 CATEGORY_MAP = {
@@ -193,14 +212,13 @@ def normalize_variant(text: str | None) -> str:
     return clean_variant(text)
 
 
-def stage0_sections(text: str, source: str, page_num: int) -> List[dict]:
+async def stage0_sections(text: str, source: str, page_num: int) -> List[dict]:
     user = f"Source: {source}\nPage: {page_num}\n\n{text}\n\nReturn JSON list."
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        temperature=0,
-        messages=[{"role": "system", "content": PROMPT_STAGE0}, {"role": "user", "content": user}],
-    )
-    data = _parse_json(resp.choices[0].message.content)
+    resp = await llm.achat(PROMPT_STAGE0, user)
+    data = _parse_json(resp.content)
+    if data is None:
+        llm.forget(PROMPT_STAGE0, user)
+        raise ValueError(f"stage 0 returned invalid JSON for {source} page {page_num}")
     if not data:
         return []
     if isinstance(data, dict):
@@ -211,16 +229,15 @@ def stage0_sections(text: str, source: str, page_num: int) -> List[dict]:
     return data  # type: ignore[return-value]
 
 
-def stage1_parse(section: dict) -> List[dict]:
+async def stage1_parse(section: dict) -> List[dict]:
     text = section.get("raw_text", "")
     title = section.get("section_title", "")
     user = f"Section: {title}\n\n{text}\n\nReturn JSON list."
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        temperature=0,
-        messages=[{"role": "system", "content": PROMPT_STAGE1}, {"role": "user", "content": user}],
-    )
-    data = _parse_json(resp.choices[0].message.content)
+    resp = await llm.achat(PROMPT_STAGE1, user)
+    data = _parse_json(resp.content)
+    if data is None:
+        llm.forget(PROMPT_STAGE1, user)
+        raise ValueError(f"stage 1 returned invalid JSON for section '{title}'")
     if not data:
         return []
     if isinstance(data, dict):
@@ -234,14 +251,8 @@ def stage1_parse(section: dict) -> List[dict]:
     return data  # type: ignore[return-value]
 
 
-def stage2_enrich(row: dict) -> dict | None:
-    user = f"Raw Skill Row:\n{json.dumps(row, indent=2)}\n\nReturn a JSON object."
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        temperature=0,
-        messages=[{"role": "system", "content": PROMPT_STAGE2}, {"role": "user", "content": user}],
-    )
-    data = _parse_json(resp.choices[0].message.content)
+def _enriched_skill(data: Any, row: dict) -> dict | None:
+    """Validate one stage 2 result against its raw row."""
     if not isinstance(data, dict):
         return None
     data.setdefault("source", row.get("source"))
@@ -253,6 +264,78 @@ def stage2_enrich(row: dict) -> dict | None:
         return None
 
 
+async def stage2_enrich(row: dict) -> dict:
+    user = f"Raw Skill Row:\n{json.dumps(row, indent=2)}\n\nReturn a JSON object."
+    resp = await llm.achat(PROMPT_STAGE2, user)
+    skill = _enriched_skill(_parse_json(resp.content), row)
+    if skill is None:
+        llm.forget(PROMPT_STAGE2, user)
+        raise ValueError("stage 2 result failed validation")
+    return skill
+
+
+async def stage2_enrich_batch(rows: List[dict]) -> List[dict | None]:
+    """Enrich several rows in one call; results are aligned with ``rows``.
+
+    Each row is sent with its index and the model echoes the index back, so
+    results are matched by index rather than position. Rows with a missing or
+    invalid result come back as ``None``.
+    """
+    items = [{"index": i, "row": row} for i, row in enumerate(rows)]
+    user = f"Raw Skill Rows:\n{json.dumps(items, indent=2)}\n\nReturn a JSON list."
+    resp = await llm.achat(PROMPT_STAGE2_BATCH, user)
+    data = _parse_json(resp.content)
+    if isinstance(data, dict):
+        # Tolerate {"skills": [...]} style wrappers
+        data = next((v for v in data.values() if isinstance(v, list)), [data])
+    results: List[dict | None] = [None] * len(rows)
+    for item in data if isinstance(data, list) else []:
+        if not isinstance(item, dict):
+            continue
+        idx = item.pop("index", None)
+        if isinstance(idx, int) and 0 <= idx < len(rows) and results[idx] is None:
+            results[idx] = _enriched_skill(item, rows[idx])
+    if any(r is None for r in results):
+        # Don't replay a partial answer from the cache on the next run
+        llm.forget(PROMPT_STAGE2_BATCH, user)
+    return results
+
+
+def pack_rows(
+    rows: List[dict],
+    max_tokens: int,
+    max_rows: int,
+    max_output_tokens: int = STAGE2_MAX_OUTPUT_TOKENS,
+) -> List[List[int]]:
+    """Group row indices into batches of at most ``max_tokens`` input tokens and ``max_rows`` rows.
+
+    Each enriched row is expected to cost about its own input size plus
+    ``STAGE2_ROW_OUTPUT_OVERHEAD`` output tokens, and batches are also capped
+    at ``max_output_tokens`` of that estimate so the JSON answer is not cut
+    off at the model's output limit.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = 0
+    out = 0
+    for i, row in enumerate(rows):
+        tokens = len(_ENC.encode(json.dumps(row, indent=2)))
+        expected = tokens + STAGE2_ROW_OUTPUT_OVERHEAD
+        if current and (
+            used + tokens > max_tokens
+            or out + expected > max_output_tokens
+            or len(current) >= max_rows
+        ):
+            batches.append(current)
+            current, used, out = [], 0, 0
+        current.append(i)
+        used += tokens
+        out += expected
+    if current:
+        batches.append(current)
+    return batches
+
+
 def stage3_normalize(skill: dict) -> dict:
     norm = normalize_ltad_skill(skill)
 
@@ -300,12 +383,8 @@ def _canonical_key(skill: dict) -> Tuple[str, str, str, str]:
 
 def compare_skills_llm(skills: List[dict]) -> List[List[dict]]:
     user = json.dumps(skills, indent=2)
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        temperature=0,
-        messages=[{"role": "system", "content": PROMPT_COMPARE}, {"role": "user", "content": user}],
-    )
-    data = _parse_json(resp.choices[0].message.content)
+    resp = llm.chat(PROMPT_COMPARE, user)
+    data = _parse_json(resp.content)
     if isinstance(data, list):
         groups: List[List[dict]] = []
         for g in data:
@@ -318,18 +397,33 @@ def compare_skills_llm(skills: List[dict]) -> List[List[dict]]:
 
 def merge_skills_llm(skills: List[dict]) -> dict:
     user = json.dumps(skills, indent=2)
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        temperature=0,
-        messages=[{"role": "system", "content": PROMPT_MERGE}, {"role": "user", "content": user}],
-    )
-    data = _parse_json(resp.choices[0].message.content)
+    resp = llm.chat(PROMPT_MERGE, user)
+    data = _parse_json(resp.content)
     if isinstance(data, dict):
         return data
     return skills[0]
 
 
-def deduplicate(skills: List[dict]) -> Tuple[List[dict], dict]:
+def _with_age_groups(merged_skill: dict, sub: List[dict]) -> dict:
+    ags = set()
+    for it in sub:
+        if it.get("age_groups"):
+            ags.update(it["age_groups"])
+    if merged_skill.get("age_groups"):
+        ags.update(merged_skill["age_groups"])
+    if ags:
+        merged_skill["age_groups"] = sorted(ags)
+    return merged_skill
+
+
+def deduplicate(skills: List[dict], notes_threshold: float = 0.8) -> Tuple[List[dict], dict]:
+    """Merge skills sharing a name/category/variant key.
+
+    Within a key group, entries whose teaching notes are near-duplicates
+    (MinHash estimate of 3-gram Jaccard >= ``notes_threshold``) are merged
+    locally. Only groups still holding several distinct note clusters are
+    ambiguous and go to the LLM compare/merge prompts.
+    """
     groups: Dict[Tuple[str, str, str], List[dict]] = defaultdict(list)
     for s in skills:
         key_parts = _canonical_key(s)
@@ -338,41 +432,42 @@ def deduplicate(skills: List[dict]) -> Tuple[List[dict], dict]:
 
     merged: List[dict] = []
     report_clusters: List[dict] = []
+    llm_groups = 0
 
     for grp in groups.values():
         if len(grp) == 1:
             merged.append(grp[0])
             continue
         notes = [g.get("teaching_notes") or "" for g in grp]
-        first_note = notes[0]
-        similar = all(SequenceMatcher(None, first_note, n).ratio() > 0.9 for n in notes[1:])
-        subgroups = [grp]
-        if not similar and 2 <= len(grp) <= 10:
-            subgroups = compare_skills_llm(grp)
+        reps: List[dict] = []
+        for cluster in near_duplicate_clusters(notes, notes_threshold):
+            sub = [grp[i] for i in cluster]
+            if len(sub) == 1:
+                reps.append(sub[0])
+                continue
+            merged_skill = _with_age_groups(sub[0].copy(), sub)
+            reps.append(merged_skill)
+            report_clusters.append({"original": sub, "merged": merged_skill, "method": "near_duplicate"})
+
+        if len(reps) == 1:
+            merged.extend(reps)
+            continue
+        llm_groups += 1
+        subgroups = compare_skills_llm(reps) if len(reps) <= 10 else [reps]
         for sub in subgroups:
             if len(sub) == 1:
                 merged.append(sub[0])
                 continue
-            if similar:
-                merged_skill = sub[0].copy()
-            else:
-                merged_skill = merge_skills_llm(sub)
-            ags = set()
-            for it in sub:
-                if it.get("age_groups"):
-                    ags.update(it["age_groups"])
-            if merged_skill.get("age_groups"):
-                ags.update(merged_skill["age_groups"])
-            if ags:
-                merged_skill["age_groups"] = sorted(ags)
+            merged_skill = _with_age_groups(merge_skills_llm(sub), sub)
             merged.append(merged_skill)
-            report_clusters.append({"original": sub, "merged": merged_skill})
+            report_clusters.append({"original": sub, "merged": merged_skill, "method": "llm"})
 
     report = {
         "total_before": len(skills),
         "total_after": len(merged),
         "deduplicated": len(skills) - len(merged),
         "merged_clusters": len(report_clusters),
+        "llm_compared_groups": llm_groups,
         "sample_clusters": report_clusters[:5],
     }
     return merged, report
@@ -419,30 +514,170 @@ def audit_skills(skills: List[dict], sections: List[dict]) -> dict:
 # Pipeline
 # ---------------------------------------------------------------------------
 
-def process_pdf(pdf_path: Path) -> Tuple[List[dict], List[dict], List[dict]]:
-    doc = fitz.open(pdf_path)
-    sections: List[dict] = []
-    raw_rows: List[dict] = []
-    skills: List[dict] = []
-
-    print(f"\n✅ Parsing PDF: {pdf_path.name}")
-
-    for page_no, page in enumerate(doc, start=1):
-        text = page.get_text()
-        secs = stage0_sections(text, pdf_path.name, page_no)
-        sections.extend(secs)
-        print(f"  - Stage 0 sections on page {page_no}: {len(secs)}")
-        for sec in secs:
-            rows = stage1_parse(sec)
-            raw_rows.extend(rows)
-            print(f"    • Stage 1 rows from section '{sec.get('section_title', '')}': {len(rows)}")
-            for row in rows:
-                skill = stage2_enrich(row)
-                if skill:
-                    skills.append(skill)
-    doc.close()
-    print(f"  -> Stage 2 enriched skills: {len(skills)}")
-    return sections, raw_rows, skills
+class ExtractionRunner:
+    """Run stages 0-2 as overlapping async tasks with per-stage limits.
+
+    Each page and section is its own task: a page's sections start as soon as
+    that page is parsed, and a section's rows are enriched as soon as that
+    section is parsed, so the stages overlap instead of running strictly
+    nested. Stage 2 packs a section's rows into batched calls up to a token
+    budget; rows whose batched result is missing or invalid are retried one
+    at a time. Every stage has its own
+    concurrency cap, while one shared runner applies the request rate limit
+    and retries. Results are checkpointed under keys that include a hash of
+    the stage input, so a rerun only calls the LLM for unfinished or changed
+    work. Stages raise on unparseable or invalid output (dropping it from the
+    response cache), so failed calls are retried, are not checkpointed and
+    are asked again on the next run.
+    """
+
+    def __init__(
+        self,
+        checkpoint: CheckpointStore,
+        page_concurrency: int = 4,
+        section_concurrency: int = 8,
+        row_concurrency: int = 16,
+        requests_per_minute: float | None = None,
+        retries: int = 3,
+        batch_rows: int = 12,
+        batch_tokens: int = 3000,
+        batch_output_tokens: int = STAGE2_MAX_OUTPUT_TOKENS,
+    ) -> None:
+        self.checkpoint = checkpoint
+        self.batch_rows = batch_rows
+        self.batch_tokens = batch_tokens
+        self.batch_output_tokens = batch_output_tokens
+        self.runner = RateLimitedRunner(
+            concurrency=page_concurrency + section_concurrency + row_concurrency,
+            requests_per_minute=requests_per_minute,
+            retries=retries,
+        )
+        self.limits = {
+            "stage0": asyncio.Semaphore(page_concurrency),
+            "stage1": asyncio.Semaphore(section_concurrency),
+            "stage2": asyncio.Semaphore(row_concurrency),
+        }
+        self.stats: Counter[str] = Counter()
+
+    async def _checkpointed(
+        self, stage: str, key: str, default: Any, fn: Callable[..., Awaitable[Any]], *args: Any
+    ) -> Any:
+        if key in self.checkpoint:
+            self.stats[f"{stage} resumed"] += 1
+            return self.checkpoint.get(key)
+        async with self.limits[stage]:
+            try:
+                result = await self.runner.run(fn, *args)
+            except Exception as e:
+                print(f"❌ {stage} failed for {key}: {e}")
+                self.stats[f"{stage} failed"] += 1
+                return default
+        self.checkpoint.put(key, result)
+        self.stats[f"{stage} called"] += 1
+        return result
+
+    async def row(self, row: dict) -> dict | None:
+        return await self._checkpointed(
+            "stage2", f"stage2:{content_key(row)}", None, stage2_enrich, row
+        )
+
+    async def enrich(self, rows: List[dict]) -> List[dict | None]:
+        """Stage 2 for many rows, batched; checkpoints stay per row."""
+        if self.batch_rows <= 1:
+            return list(await asyncio.gather(*(self.row(r) for r in rows)))
+
+        keys = [f"stage2:{content_key(r)}" for r in rows]
+        results: List[dict | None] = [None] * len(rows)
+        pending: List[int] = []
+        for i, key in enumerate(keys):
+            if key in self.checkpoint:
+                self.stats["stage2 resumed"] += 1
+                results[i] = self.checkpoint.get(key)
+            else:
+                pending.append(i)
+
+        async def _batch(idx: List[int]) -> None:
+            async with self.limits["stage2"]:
+                try:
+                    out = await self.runner.run(stage2_enrich_batch, [rows[i] for i in idx])
+                    self.stats["stage2 batch calls"] += 1
+                except Exception as e:
+                    print(f"❌ stage2 batch of {len(idx)} rows failed: {e}")
+                    out = [None] * len(idx)
+            retry = []
+            for i, skill in zip(idx, out):
+                if skill is None:
+                    retry.append(i)
+                    continue
+                self.checkpoint.put(keys[i], skill)
+                self.stats["stage2 batched rows"] += 1
+                results[i] = skill
+            if retry:
+                self.stats["stage2 row retries"] += len(retry)
+                singles = await asyncio.gather(*(self.row(rows[i]) for i in retry))
+                for i, skill in zip(retry, singles):
+                    results[i] = skill
+
+        pending_rows = [rows[i] for i in pending]
+        await asyncio.gather(
+            *(
+                _batch([pending[j] for j in batch])
+                for batch in pack_rows(
+                    pending_rows, self.batch_tokens, self.batch_rows, self.batch_output_tokens
+                )
+            )
+        )
+        return results
+
+    async def section(self, sec: dict) -> Tuple[List[dict], List[dict]]:
+        rows = await self._checkpointed(
+            "stage1", f"stage1:{content_key(sec)}", [], stage1_parse, sec
+        )
+        print(f"    • Stage 1 rows from section '{sec.get('section_title', '')}': {len(rows)}")
+        skills = [s for s in await self.enrich(rows) if s]
+        return rows, skills
+
+    async def page(self, source: str, page_no: int, text: str) -> Tuple[List[dict], List[dict], List[dict]]:
+        key = f"stage0:{source}:{page_no}:{content_key(text)}"
+        secs = await self._checkpointed("stage0", key, [], stage0_sections, text, source, page_no)
+        print(f"  - Stage 0 sections on {source} page {page_no}: {len(secs)}")
+        results = await asyncio.gather(*(self.section(sec) for sec in secs))
+        rows = [r for sec_rows, _ in results for r in sec_rows]
+        skills = [s for _, sec_skills in results for s in sec_skills]
+        return secs, rows, skills
+
+    async def pdf(self, pdf_path: Path) -> Tuple[List[dict], List[dict], List[dict]]:
+        print(f"\n✅ Parsing PDF: {pdf_path.name}")
+        with fitz.open(pdf_path) as doc:
+            pages = [page.get_text() for page in doc]
+        results = await asyncio.gather(
+            *(self.page(pdf_path.name, n, text) for n, text in enumerate(pages, start=1))
+        )
+        sections = [s for secs, _, _ in results for s in secs]
+        raw_rows = [r for _, rows, _ in results for r in rows]
+        skills = [s for _, _, sk in results for s in sk]
+        print(f"  -> {pdf_path.name}: Stage 2 enriched skills: {len(skills)}")
+        return sections, raw_rows, skills
+
+
+async def extract_all(
+    pdfs: List[Path], runner: ExtractionRunner
+) -> Tuple[List[dict], List[dict], List[dict]]:
+    """Run stages 0-2 over every PDF concurrently, keeping results in PDF order."""
+
+    async def _one(pdf: Path) -> Tuple[List[dict], List[dict], List[dict]]:
+        print(f"📖 Processing {pdf.name}")
+        try:
+            return await runner.pdf(pdf)
+        except Exception as e:
+            print(f"❌ Failed to process {pdf.name}: {e}")
+            return [], [], []
+
+    results = await asyncio.gather(*(_one(pdf) for pdf in pdfs))
+    sections = [s for secs, _, _ in results for s in secs]
+    rows = [r for _, rs, _ in results for r in rs]
+    skills = [s for _, _, sk in results for s in sk]
+    return sections, rows, skills
 
 
 # ---------------------------------------------------------------------------
@@ -453,23 +688,60 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Generate LTAD skill index")
     parser.add_argument("--input-folder", type=Path, default=Path("data/raw/ltad"))
     parser.add_argument("--output", type=Path, default=Path("data/processed/ltad_skills_final.json"))
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=DEFAULT_CHECKPOINT,
+        help="Checkpoint of completed pages/sections/rows used to resume",
+    )
+    parser.add_argument("--fresh", action="store_true", help="Discard the checkpoint and start over")
+    parser.add_argument("--page-concurrency", type=int, default=4, help="Concurrent stage 0 calls")
+    parser.add_argument("--section-concurrency", type=int, default=8, help="Concurrent stage 1 calls")
+    parser.add_argument("--row-concurrency", type=int, default=16, help="Concurrent stage 2 calls")
+    parser.add_argument(
+        "--enrich-batch-rows",
+        type=int,
+        default=12,
+        help="Rows per stage 2 call (1 = one call per row)",
+    )
+    parser.add_argument(
+        "--enrich-batch-tokens",
+        type=int,
+        default=3000,
+        help="Input token budget for the rows in one stage 2 call",
+    )
+    parser.add_argument(
+        "--enrich-output-tokens",
+        type=int,
+        default=STAGE2_MAX_OUTPUT_TOKENS,
+        help="Expected output token budget for one stage 2 call (model limit is 4096)",
+    )
+    parser.add_argument("--llm-rpm", type=float, help="Rate limit across all stages (requests per minute)")
+    parser.add_argument("--llm-retries", type=int, default=3, help="Retries per call with backoff")
     args = parser.parse_args()
 
-    all_sections: List[dict] = []
-    all_rows: List[dict] = []
-    all_skills: List[dict] = []
+    checkpoint = CheckpointStore(args.checkpoint)
+    if args.fresh:
+        checkpoint.clear()
+    elif len(checkpoint):
+        print(f"♻️ Resuming from {args.checkpoint} ({len(checkpoint)} completed items)")
+    runner = ExtractionRunner(
+        checkpoint,
+        page_concurrency=args.page_concurrency,
+        section_concurrency=args.section_concurrency,
+        row_concurrency=args.row_concurrency,
+        requests_per_minute=args.llm_rpm,
+        retries=args.llm_retries,
+        batch_rows=args.enrich_batch_rows,
+        batch_tokens=args.enrich_batch_tokens,
+        batch_output_tokens=args.enrich_output_tokens,
+    )
 
-    print("\n✅ Starting Stage 1: Parse Raw Skill Rows")
-    for pdf in sorted(args.input_folder.glob("*.pdf")):
-        print(f"📖 Processing {pdf.name}")
-        try:
-            secs, rows, skills = process_pdf(pdf)
-            all_sections.extend(secs)
-            all_rows.extend(rows)
-            all_skills.extend(skills)
-        except Exception as e:
-            print(f"❌ Failed to process {pdf.name}: {e}")
+    print("\n✅ Starting Stages 0-2: Sections, Raw Skill Rows, Enrichment")
+    pdfs = sorted(args.input_folder.glob("*.pdf"))
+    all_sections, all_rows, all_skills = asyncio.run(extract_all(pdfs, runner))
     print(f"-> Parsed sections: {len(all_sections)} | rows: {len(all_rows)} | skills: {len(all_skills)}")
+    print("-> LLM calls: " + ", ".join(f"{k}: {v}" for k, v in sorted(runner.stats.items())))
 
     print("\n✅ Starting Stage 3: Normalize Skills")
 
@@ -512,6 +784,7 @@ def main() -> None:
     print(f"✅ Final skills: {len(deduped)} (deduped from {len(all_skills)})")
     print(f"✅ Dedup report: {report_path}")
     print(f"✅ Audit report: {audit_path}")
+    print(llm.cache.report())
 
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 # scripts/index_drills_chroma.py
 import os
+import hashlib
 import json
+import argparse
 from pathlib import Path
 from typing import List
 
@@ -14,12 +16,29 @@ load_dotenv()
 
 # Setup Chroma client
 import sys
-sys.path.append(str(Path(__file__).parent.parent / "mcp_server"))
-from chroma_utils import get_chroma_collection, clear_chroma_collection
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from mcp_server.off_ice.chroma_utils import (
+    IndexManifest,
+    clear_chroma_collection,
+    collection_name,
+    get_chroma_collection,
+    sync_collection,
+)
 
-clear_chroma_collection()
+parser = argparse.ArgumentParser(description="Index processed drills into Chroma")
+parser.add_argument(
+    "--full",
+    action="store_true",
+    help="Clear all drill documents and re-add everything instead of syncing changes",
+)
+args = parser.parse_args()
 
-collection = get_chroma_collection()
+manifest = IndexManifest.for_scope(collection_name("drill"), "drill-")
+if args.full:
+    clear_chroma_collection(mode="type", prefix="drill-", corpus="drill")
+    manifest.clear()
+
+collection = get_chroma_collection("drill")
 
 # === Load classified drills ===
 DATA_PATH = Path(__file__).parent.parent / "data" / "processed" / "drills.json"
@@ -70,12 +89,26 @@ def metadata_for(drill: dict) -> dict:
     }
 
 
+# === Stable IDs so inserting or removing a drill doesn't shift the rest ===
+def drill_ids(drills: List[dict]) -> List[str]:
+    ids, seen = [], {}
+    for drill in drills:
+        title = safe_str(drill.get("title")).strip().lower()
+        # Key on source + title; fall back to the full text for untitled drills
+        natural = f"{safe_str(drill.get('source')).strip().lower()}\0{title}" if title else drill_text(drill)
+        base = f"drill-{hashlib.sha256(natural.encode('utf-8')).hexdigest()[:16]}"
+        seen[base] = seen.get(base, 0) + 1
+        ids.append(base if seen[base] == 1 else f"{base}-{seen[base]}")
+    return ids
+
+
 # === Index drills ===
 docs = [drill_text(d) for d in data]
 metadatas = [metadata_for(d) for d in data]
-ids = [f"drill-{i}" for i in range(len(data))]
+ids = drill_ids(data)
 
-collection.add(documents=docs, metadatas=metadatas, ids=ids)
+upserted, deleted = sync_collection(collection, ids, docs, metadatas, manifest)
+print(f"🔁 Upserted {upserted} drills, deleted {deleted} stale drills")
 print("Count:", collection.count())
 results = collection.get(include=["documents", "metadatas"], limit=5)
 for i, doc in enumerate(results["documents"]):
@@ -83,4 +116,4 @@ for i, doc in enumerate(results["documents"]):
     print("  ID:", results["ids"][i])  # this is always included even if not in `include`
     print("  Title:", results["metadatas"][i].get("title"))
     print("  Text:", doc[:100], "...")
-print(f"✅ Indexed {len(docs)} drills into Chroma")
+print(f"✅ {len(docs)} drills in sync with Chroma")
@@ -10,7 +10,7 @@ import sys
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from app.mcp_server.chroma_utils import get_chroma_collection
+from mcp_server.off_ice.chroma_utils import bulk_ingest, existing_ids, get_chroma_collection
 
 
 def doc_text(skill: dict) -> str:
@@ -62,6 +62,8 @@ def main() -> None:
         action="store_true",
         help="Load and summarize data without indexing to Chroma",
     )
+    parser.add_argument("--batch-size", type=int, default=500, help="Skills per upsert request")
+    parser.add_argument("--workers", type=int, default=4, help="Upsert requests in flight")
     args = parser.parse_args()
 
     with open(args.input, "r", encoding="utf-8") as f:
@@ -76,18 +78,19 @@ def main() -> None:
         Counter(g for s in data for g in (s.get("age_groups") or [])).most_common(),
     )
 
-    existing_ids: set[str] = set()
+    all_ids = [f"ltad-{idx}" for idx in range(len(data))]
+    present: set[str] = set()
     if args.dry_run:
         print("--dry-run enabled: skipping Chroma indexing")
         collection = None
     else:
-        collection = get_chroma_collection()
-        existing_ids = set(collection.get().get("ids", []))
+        collection = get_chroma_collection("ltad")
+        present = existing_ids(collection, all_ids)
 
     docs, metadatas, ids = [], [], []
     for idx, skill in enumerate(data):
-        doc_id = f"ltad-{idx}"
-        if doc_id in existing_ids:
+        doc_id = all_ids[idx]
+        if doc_id in present:
             continue
         meta = metadata_for(skill)
         if not meta:
@@ -106,9 +109,19 @@ def main() -> None:
             json.dump(snapshot, f, indent=2)
 
         if not args.dry_run:
-            collection.add(documents=docs, metadatas=metadatas, ids=ids)
+            written, _, failed = bulk_ingest(
+                collection,
+                ids,
+                docs,
+                metadatas,
+                batch_size=args.batch_size,
+                workers=args.workers,
+                skip_existing=False,
+            )
+            if failed:
+                print(f"❌ Failed to index {failed} LTAD skills")
             print("Count:", collection.count())
-            print(f"✅ Indexed {len(docs)} LTAD skills into Chroma")
+            print(f"✅ Indexed {written} LTAD skills into Chroma")
         else:
             print(f"✅ Prepared {len(docs)} documents (dry run)")
     else:
@@ -8,13 +8,12 @@ import json
 from pathlib import Path
 from typing import List
 
-from more_itertools import chunked
 import sys
 
 # Add repo root to PYTHONPATH
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from app.mcp_server.chroma_utils import get_chroma_collection
+from mcp_server.off_ice.chroma_utils import bulk_ingest, get_chroma_collection
 
 
 # ---------------------------------------------------------------------------
@@ -67,43 +66,43 @@ def main() -> None:
         help="Path to mlhs_insights.json",
     )
     parser.add_argument(
-        "--chunk-size", type=int, default=100, help="Number of insights per batch"
+        "--batch-size", type=int, default=500, help="Number of insights per upsert request"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Upsert requests in flight"
     )
     args = parser.parse_args()
 
     with open(args.input, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    collection = get_chroma_collection()
-    existing_ids = set(collection.get()["ids"])
-
     docs: List[str] = []
     metas: List[dict] = []
     ids: List[str] = []
+    seen: set[str] = set()
 
     for ins in data:
         doc_id = f"insight-{ins.get('id')}"
-        if doc_id in existing_ids:
+        if doc_id in seen:
             continue
+        seen.add(doc_id)
         docs.append(insight_text(ins))
         metas.append(metadata_for(ins))
         ids.append(doc_id)
 
     if not docs:
-        print("No new insights to index")
+        print("No insights to index")
         return
 
-    for i, (d_chunk, m_chunk, id_chunk) in enumerate(
-        zip(chunked(docs, args.chunk_size), chunked(metas, args.chunk_size), chunked(ids, args.chunk_size))
-    ):
-        print(f"📦 Indexing chunk {i+1} with {len(d_chunk)} insights...")
-        try:
-            collection.add(documents=d_chunk, metadatas=m_chunk, ids=id_chunk)
-        except Exception as e:
-            print(f"❌ Failed to index chunk {i+1}: {e}")
+    collection = get_chroma_collection("nhl_insight")
+    written, skipped, failed = bulk_ingest(
+        collection, ids, docs, metas, batch_size=args.batch_size, workers=args.workers
+    )
+    if failed:
+        print(f"❌ Failed to index {failed} insights")
 
     print("Count:", collection.count())
-    print(f"✅ Indexed {len(docs)} insights into Chroma")
+    print(f"✅ Indexed {written} insights into Chroma ({skipped} already indexed)")
 
 
 if __name__ == "__main__":
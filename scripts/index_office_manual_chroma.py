@@ -13,7 +13,7 @@ import sys
 # Add repo root to PYTHONPATH
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from app.mcp_server.chroma_utils import get_chroma_collection
+from mcp_server.off_ice.chroma_utils import bulk_ingest, existing_ids, get_chroma_collection
 
 
 # ---------------------------------------------------------------------------
@@ -69,6 +69,8 @@ def main() -> None:
     )
     parser.add_argument("--dry-run", action="store_true", help="Print summary without indexing")
     parser.add_argument("--limit", type=int, help="Only index first N entries")
+    parser.add_argument("--batch-size", type=int, default=500, help="Entries per upsert request")
+    parser.add_argument("--workers", type=int, default=4, help="Upsert requests in flight")
     args = parser.parse_args()
 
     try:
@@ -82,40 +84,31 @@ def main() -> None:
         data = data[: args.limit]
     print(f"📂 Loaded {len(data)} entries from {args.input}")
 
-    collection = get_chroma_collection()
-    existing = set(collection.get().get("ids", []))
-    indexed = 0
+    docs, metas, ids = [], [], []
     skipped = 0
-
     for idx, entry in enumerate(data):
         doc_id = f"office-{idx}"
-        title = entry.get("title") or ""
-
-        if doc_id in existing:
-            print(f"⏭️  Skipping {doc_id}: already indexed")
-            skipped += 1
-            continue
-
         if not (entry.get("title") and entry.get("description") and entry.get("category")):
             print(f"⚠️ Skipping {doc_id}: missing required fields")
             skipped += 1
             continue
-
-        print(f"Indexing {doc_id}: {title}")
-        if args.dry_run:
-            indexed += 1
-            continue
-
-        try:
-            collection.add(
-                documents=[doc_text(entry)],
-                metadatas=[metadata_for(entry)],
-                ids=[doc_id],
-            )
-            indexed += 1
-        except Exception as e:
-            print(f"❌ Failed to index {doc_id}: {e}")
-            skipped += 1
+        docs.append(doc_text(entry))
+        metas.append(metadata_for(entry))
+        ids.append(doc_id)
+
+    collection = get_chroma_collection("off_ice_training")
+    if args.dry_run:
+        present = existing_ids(collection, ids)
+        indexed = len(ids) - len(present)
+        skipped += len(present)
+        print(f"--dry-run enabled: {indexed} entries would be indexed, {len(present)} already indexed")
+    else:
+        indexed, already, failed = bulk_ingest(
+            collection, ids, docs, metas, batch_size=args.batch_size, workers=args.workers
+        )
+        if failed:
+            print(f"❌ Failed to index {failed} entries")
+        skipped += already + failed
 
     print(f"✅ Indexed {indexed} entries, skipped {skipped}")
     try:
@@ -3,14 +3,19 @@ import json
 import argparse
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
-from more_itertools import chunked
 import tiktoken
 
 import sys
 sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.clip_store import ClipStore
 from mcp_server.off_ice.chroma_utils import (
+    EMBEDDING_MAX_BATCH_TOKENS,
+    EMBEDDING_MAX_INPUT_TOKENS,
+    IndexManifest,
+    collection_name,
     get_chroma_collection,
     clear_chroma_collection,
+    sync_collection,
 )
 
 def extract_video_id(url: str) -> str | None:
@@ -36,13 +41,20 @@ def extract_video_id(url: str) -> str | None:
 
 
 
-def clip_text(clip: dict) -> str:
-    """Assemble a text block for embedding."""
-    parts = [
+def clip_header(clip: dict) -> str:
+    """Identifying lines repeated at the top of every sub-chunk."""
+    return "\n".join([
         f"Video ID: {clip.get('video_id', '')}",
         f"Segment ID: {clip.get('segment_id', '')}",
         f"Query Term: {clip.get('query_term', '')}",
         f"Title: {clip.get('title', '')}",
+    ])
+
+
+def clip_text(clip: dict) -> str:
+    """Assemble a text block for embedding."""
+    parts = [
+        clip_header(clip),
         f"Summary: {clip.get('summary', '')}",
         clip.get("transcript", ""),
         "Teaching Points: " + ", ".join(clip.get("teaching_points", [])),
@@ -54,11 +66,33 @@ def clip_text(clip: dict) -> str:
         f"Audience: {clip.get('intended_audience', '')}",
         f"Focus: {clip.get('play_or_skill_focus', '')}",
     ]
-    text = "\n".join(part for part in parts if part)
-    # Ensure we don't embed extremely long documents
-    if len(text) > 16000:
-        text = text[:16000]
-    return text
+    return "\n".join(part for part in parts if part)
+
+
+def split_document(
+    text: str, header: str, enc, max_tokens: int, overlap: int
+) -> list[tuple[str, int]]:
+    """Split ``text`` into ``(chunk, tokens)`` pieces of at most ``max_tokens``.
+
+    Documents that fit are returned whole. Longer ones are cut into
+    overlapping token windows, each prefixed with ``header`` and its part
+    number so every piece is self-describing.
+    """
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        return [(text, len(tokens))]
+    # Reserve room for the header and "(part i/n)" marker on each piece
+    window = max_tokens - len(enc.encode(header)) - 16
+    if window <= overlap:
+        raise ValueError(f"max_tokens={max_tokens} leaves no room after the header and overlap")
+    body = enc.encode(text[len(header) :].lstrip("\n") if text.startswith(header) else text)
+    step = window - overlap
+    starts = range(0, max(len(body) - overlap, 1), step)
+    pieces = []
+    for n, start in enumerate(starts, 1):
+        chunk = f"{header}\n(part {n}/{len(starts)})\n{enc.decode(body[start : start + window])}"
+        pieces.append((chunk, len(enc.encode(chunk))))
+    return pieces
 
 
 def metadata_for(clip: dict) -> dict:
@@ -94,11 +128,14 @@ def load_clips(files: list[Path]) -> tuple[list[dict], dict[str, int]]:
     counts: dict[str, int] = {}
     for fp in files:
         try:
-            with open(fp, "r", encoding="utf-8") as f:
-                items = json.load(f)
-                clips.extend(items)
-                counts[fp.name] = len(items)
-                print(f"📂 Loaded {len(items)} clips from {fp}")
+            if fp.suffix == ".jsonl":
+                items = list(ClipStore(fp).iter_clips())
+            else:
+                with open(fp, "r", encoding="utf-8") as f:
+                    items = json.load(f)
+            clips.extend(items)
+            counts[fp.name] = len(items)
+            print(f"📂 Loaded {len(items)} clips from {fp}")
         except Exception as e:
             print(f"❌ Failed to load {fp}: {e}")
     return clips, counts
@@ -106,13 +143,39 @@ def load_clips(files: list[Path]) -> tuple[list[dict], dict[str, int]]:
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Index video clip JSON files into Chroma")
-    parser.add_argument("--input-folder", type=Path, help="Folder containing clip JSON files")
+    parser.add_argument("--input-folder", type=Path, help="Folder containing clip .jsonl stores or JSON files")
     parser.add_argument("--input-files", nargs="*", type=Path, help="Specific clip JSON files")
     parser.add_argument(
         "--chunk-size",
         type=int,
-        default=100,
-        help="Number of clips per indexing chunk",
+        default=1000,
+        help="Maximum documents per upsert batch",
+    )
+    parser.add_argument(
+        "--batch-tokens",
+        type=int,
+        default=EMBEDDING_MAX_BATCH_TOKENS,
+        help="Token budget per upsert batch (embedding request limit)",
+    )
+    parser.add_argument(
+        "--max-doc-tokens",
+        type=int,
+        default=EMBEDDING_MAX_INPUT_TOKENS,
+        help="Split documents longer than this into linked sub-chunks",
+    )
+    parser.add_argument(
+        "--overlap-tokens",
+        type=int,
+        default=200,
+        help="Tokens shared between consecutive sub-chunks",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Upsert batches sent concurrently"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Wipe previously indexed clips and re-add everything instead of syncing changes",
     )
     args = parser.parse_args()
     chunk_size = args.chunk_size
@@ -120,38 +183,57 @@ def main() -> None:
 
     files: list[Path] = []
     if args.input_folder:
-        files.extend(sorted(Path(args.input_folder).glob("*.json")))
+        folder = Path(args.input_folder)
+        stores = sorted(folder.glob("*.jsonl"))
+        # A legacy .json next to its .jsonl store has already been imported
+        legacy = [p for p in sorted(folder.glob("*.json")) if not p.with_suffix(".jsonl").exists()]
+        files.extend(stores + legacy)
     if args.input_files:
         files.extend(args.input_files)
     if not files:
-        files = [Path(__file__).parent.parent / "data" / "processed" / "video_clips.json"]
+        files = [Path(__file__).parent.parent / "data" / "processed" / "video_clips.jsonl"]
 
-    # Wipe only existing video documents so drills remain intact
-    clear_chroma_collection(mode="type", prefix="video-")
-    collection = get_chroma_collection()
+    manifest = IndexManifest.for_scope(collection_name("video"), "video-")
+    if args.full:
+        # Wipe only existing video documents so drills remain intact
+        clear_chroma_collection(mode="type", prefix="video-", corpus="video")
+        manifest.clear()
+    collection = get_chroma_collection("video")
 
     data, file_counts = load_clips(files)
 
-    docs, metadatas, ids = [], [], []
+    docs, metadatas, ids, token_counts = [], [], [], []
     video_ids = set()
     query_terms: dict[str, int] = {}
-    manifest: dict[str, dict] = {}
+    videos: dict[str, dict] = {}
     max_tokens = 0
+    split_clips = 0
 
     for clip in data:
         text = clip_text(clip)
-        docs.append(text)
         meta = metadata_for(clip)
-        metadatas.append(meta)
-        tokens = len(enc.encode(text))
-        if tokens > max_tokens:
-            max_tokens = tokens
         vid_id = clip.get("video_id") or extract_video_id(clip.get("video_url", ""))
         seg_id = clip.get("segment_id") or f"{vid_id}_{clip.get('segment_number', '')}"
-        ids.append(f"video-{seg_id}")
+        parent_id = f"video-{seg_id}"
+        pieces = split_document(
+            text, clip_header(clip), enc, args.max_doc_tokens, args.overlap_tokens
+        )
+        if len(pieces) == 1:
+            docs.append(text)
+            metadatas.append(meta)
+            ids.append(parent_id)
+            token_counts.append(pieces[0][1])
+        else:
+            split_clips += 1
+            for n, (piece, tokens) in enumerate(pieces, 1):
+                docs.append(piece)
+                metadatas.append({**meta, "parent_id": parent_id, "part": n, "parts": len(pieces)})
+                ids.append(f"{parent_id}-part{n}")
+                token_counts.append(tokens)
+        max_tokens = max(max_tokens, len(enc.encode(text)))
         if vid_id:
             video_ids.add(str(vid_id))
-            m = manifest.setdefault(str(vid_id), {
+            m = videos.setdefault(str(vid_id), {
                 "video_id": str(vid_id),
                 "query_term": clip.get("query_term", ""),
                 "clip_count": 0,
@@ -162,21 +244,24 @@ def main() -> None:
         if term:
             query_terms[term] = query_terms.get(term, 0) + 1
 
+    # Sync even with no input so clips removed from every file are deleted
+    upserted, deleted = sync_collection(
+        collection,
+        ids,
+        docs,
+        metadatas,
+        manifest,
+        batch_size=chunk_size,
+        token_counts=token_counts,
+        token_budget=args.batch_tokens,
+        workers=args.workers,
+    )
+    print(f"🔁 Upserted {upserted} documents, deleted {deleted} stale documents")
+
     if docs:
         print(f"📏 Largest document has {max_tokens} tokens")
-        for i, (doc_chunk, meta_chunk, id_chunk) in enumerate(
-            zip(
-                chunked(docs, chunk_size),
-                chunked(metadatas, chunk_size),
-                chunked(ids, chunk_size),
-            )
-        ):
-            print(f"📦 Indexing chunk {i+1} with {len(doc_chunk)} clips...")
-            try:
-                collection.add(documents=doc_chunk, metadatas=meta_chunk, ids=id_chunk)
-            except Exception as e:
-                print(f"❌ Failed to index chunk {i+1}: {e}")
-                continue
+        if split_clips:
+            print(f"✂️ Split {split_clips} clips over {args.max_doc_tokens} tokens into sub-chunks")
 
         print("Count:", collection.count())
         results = collection.get(include=["documents", "metadatas"], limit=5)
@@ -187,7 +272,7 @@ def main() -> None:
             print("  Text:", doc[:100], "...")
         for fname, cnt in file_counts.items():
             print(f"✅ Indexed {cnt} clips from {fname}")
-        print(f"Total clips indexed: {len(docs)}")
+        print(f"Total clips indexed: {len(data)} ({len(docs)} documents)")
         print(f"Unique video_id count: {len(video_ids)}")
         if query_terms:
             print("Query term distribution:")
@@ -200,10 +285,11 @@ def main() -> None:
         with open(manifest_path, "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=["video_id", "query_term", "clip_count", "publish_time"])
             writer.writeheader()
-            writer.writerows(manifest.values())
+            writer.writerows(videos.values())
         summary = {
             "files": file_counts,
-            "total_clips": len(docs),
+            "total_clips": len(data),
+            "total_documents": len(docs),
             "unique_videos": len(video_ids),
             "query_terms": query_terms,
         }
@@ -3,14 +3,17 @@ import json
 import argparse
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
-from more_itertools import chunked
 import tiktoken
 
 import sys
 sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.clip_store import ClipStore
 from mcp_server.off_ice.chroma_utils import (
+    IndexManifest,
+    collection_name,
     get_chroma_collection,
     clear_chroma_collection,
+    sync_collection,
 )
 
 def extract_video_id(url: str) -> str | None:
@@ -95,11 +98,14 @@ def load_clips(files: list[Path]) -> tuple[list[dict], dict[str, int]]:
     counts: dict[str, int] = {}
     for fp in files:
         try:
-            with open(fp, "r", encoding="utf-8") as f:
-                items = json.load(f)
-                clips.extend(items)
-                counts[fp.name] = len(items)
-                print(f"📂 Loaded {len(items)} clips from {fp}")
+            if fp.suffix == ".jsonl":
+                items = list(ClipStore(fp).iter_clips())
+            else:
+                with open(fp, "r", encoding="utf-8") as f:
+                    items = json.load(f)
+            clips.extend(items)
+            counts[fp.name] = len(items)
+            print(f"📂 Loaded {len(items)} clips from {fp}")
         except Exception as e:
             print(f"❌ Failed to load {fp}: {e}")
     return clips, counts
@@ -107,7 +113,7 @@ def load_clips(files: list[Path]) -> tuple[list[dict], dict[str, int]]:
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Index video clip JSON files into Chroma")
-    parser.add_argument("--input-folder", type=Path, help="Folder containing clip JSON files")
+    parser.add_argument("--input-folder", type=Path, help="Folder containing clip .jsonl stores or JSON files")
     parser.add_argument("--input-files", nargs="*", type=Path, help="Specific clip JSON files")
     parser.add_argument(
         "--chunk-size",
@@ -115,28 +121,40 @@ def main() -> None:
         default=100,
         help="Number of clips per indexing chunk",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Wipe previously indexed clips and re-add everything instead of syncing changes",
+    )
     args = parser.parse_args()
     chunk_size = args.chunk_size
     enc = tiktoken.get_encoding("cl100k_base")
 
     files: list[Path] = []
     if args.input_folder:
-        files.extend(sorted(Path(args.input_folder).glob("*.json")))
+        folder = Path(args.input_folder)
+        stores = sorted(folder.glob("*.jsonl"))
+        # A legacy .json next to its .jsonl store has already been imported
+        legacy = [p for p in sorted(folder.glob("*.json")) if not p.with_suffix(".jsonl").exists()]
+        files.extend(stores + legacy)
     if args.input_files:
         files.extend(args.input_files)
     if not files:
-        files = [Path(__file__).parent.parent / "data" / "processed" / "video_clips_dryland.json"]
+        files = [Path(__file__).parent.parent / "data" / "processed" / "video_clips_dryland.jsonl"]
 
-    # Wipe only existing dryland documents so drills remain intact
-    #clear_chroma_collection(mode="type", prefix="dryland-")
-    collection = get_chroma_collection()
+    manifest = IndexManifest.for_scope(collection_name("off_ice_video"), "dryland-")
+    if args.full:
+        # Wipe only existing dryland documents so drills remain intact
+        clear_chroma_collection(mode="type", prefix="dryland-", corpus="off_ice_video")
+        manifest.clear()
+    collection = get_chroma_collection("off_ice_video")
 
     data, file_counts = load_clips(files)
 
     docs, metadatas, ids = [], [], []
     video_ids = set()
     query_terms: dict[str, int] = {}
-    manifest: dict[str, dict] = {}
+    videos: dict[str, dict] = {}
     max_tokens = 0
 
     for clip in data:
@@ -152,7 +170,7 @@ def main() -> None:
         ids.append(f"dryland-{seg_id}")
         if vid_id:
             video_ids.add(str(vid_id))
-            m = manifest.setdefault(str(vid_id), {
+            m = videos.setdefault(str(vid_id), {
                 "video_id": str(vid_id),
                 "query_term": clip.get("query_term", ""),
                 "clip_count": 0,
@@ -163,21 +181,14 @@ def main() -> None:
         if term:
             query_terms[term] = query_terms.get(term, 0) + 1
 
+    # Sync even with no input so clips removed from every file are deleted
+    upserted, deleted = sync_collection(
+        collection, ids, docs, metadatas, manifest, batch_size=chunk_size
+    )
+    print(f"🔁 Upserted {upserted} clips, deleted {deleted} stale clips")
+
     if docs:
         print(f"📏 Largest document has {max_tokens} tokens")
-        for i, (doc_chunk, meta_chunk, id_chunk) in enumerate(
-            zip(
-                chunked(docs, chunk_size),
-                chunked(metadatas, chunk_size),
-                chunked(ids, chunk_size),
-            )
-        ):
-            print(f"📦 Indexing chunk {i+1} with {len(doc_chunk)} clips...")
-            try:
-                collection.add(documents=doc_chunk, metadatas=meta_chunk, ids=id_chunk)
-            except Exception as e:
-                print(f"❌ Failed to index chunk {i+1}: {e}")
-                continue
 
         print("Count:", collection.count())
         results = collection.get(include=["documents", "metadatas"], limit=5)
@@ -201,7 +212,7 @@ def main() -> None:
         with open(manifest_path, "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=["video_id", "query_term", "clip_count", "publish_time"])
             writer.writeheader()
-            writer.writerows(manifest.values())
+            writer.writerows(videos.values())
         summary = {
             "files": file_counts,
             "total_clips": len(docs),
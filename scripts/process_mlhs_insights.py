@@ -3,20 +3,29 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import itertools
 import json
+import os
 import sys
+import time
+from collections import Counter
 from pathlib import Path
-from typing import List, Set
+from typing import Iterable, List, Set
 from uuid import uuid4
 
-from openai import OpenAI
-
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from models.mlhs_article import MLHSArticle
 from models.nhl_insight import NHLInsight
+from utils.article_store import ArticleStore
+from utils.checkpoint import CheckpointStore
+from utils.near_duplicates import near_duplicate_clusters
+from utils.rate_limit import RateLimitedRunner
+from utils.text_chunks import chunk_paragraphs, html_to_paragraphs
+from utils.llm import LLM
 
-client = OpenAI()
+llm = LLM(model="gpt-3.5-turbo-0125")
 PROMPT_PATH = (
     Path(__file__).resolve().parent.parent / "prompts" / "nhl_insight_extraction.txt"
 )
@@ -48,11 +57,6 @@ def _load_json_if_exists(path: Path) -> list[dict]:
     return []
 
 
-def load_articles(path: Path) -> List[MLHSArticle]:
-    data = _load_json_if_exists(path)
-    return [MLHSArticle(**d) for d in data]
-
-
 def load_existing_insights(path: Path) -> tuple[List[NHLInsight], Set[str]]:
     raw = _load_json_if_exists(path)
     insights: List[NHLInsight] = []
@@ -67,21 +71,75 @@ def load_existing_insights(path: Path) -> tuple[List[NHLInsight], Set[str]]:
     return insights, urls
 
 
-def extract_insights_llm(article: MLHSArticle) -> List[NHLInsight]:
-    user = f"ARTICLE HTML:\n{article.html_content}"
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo-0125",
-        temperature=0,
-        messages=[
-            {"role": "system", "content": INSIGHT_PROMPT},
-            {"role": "user", "content": user},
-        ],
+def article_chunks(article: MLHSArticle, chunk_words: int = 900) -> List[str]:
+    """Clean article text split into overlapping, quote-preserving chunks."""
+    return chunk_paragraphs(html_to_paragraphs(article.html_content), max_words=chunk_words)
+
+
+async def _extract_chunk(
+    article: MLHSArticle, chunk: str, part: int, parts: int
+) -> tuple[List[dict], Counter]:
+    header = f"ARTICLE: {article.title}"
+    if parts > 1:
+        header += f"\nEXCERPT {part}/{parts}"
+    user = f"{header}\n\n{chunk}"
+    resp = await llm.achat(INSIGHT_PROMPT, user)
+    usage = Counter(
+        {
+            "prompt_tokens": int(resp.usage.get("prompt_tokens") or 0),
+            "completion_tokens": int(resp.usage.get("completion_tokens") or 0),
+            "calls": 1,
+            "cached_calls": int(resp.cached),
+        }
     )
-    data = _parse_json(resp.choices[0].message.content)
+    data = _parse_json(resp.content)
+    if data is None:
+        # Drop the bad completion so the runner's retry asks the model again
+        llm.forget(INSIGHT_PROMPT, user)
+        raise ValueError(f"invalid JSON for {article.url} excerpt {part}/{parts}")
     if not data:
-        return []
+        return [], usage
     if isinstance(data, dict):
         data = [data]
+    return [d for d in data if isinstance(d, dict) and d.get("quote")], usage
+
+
+def merge_chunk_insights(items: List[dict], threshold: float = 0.8) -> List[dict]:
+    """Drop insights repeated across overlapping chunks.
+
+    Near-duplicate quotes are clustered and the most complete entry (most
+    filled fields, then longest quote) is kept; order follows first mention.
+    """
+    quotes = [str(d.get("quote", "")) for d in items]
+    kept = []
+    for cluster in near_duplicate_clusters(quotes, threshold):
+        best = max(
+            (items[i] for i in cluster),
+            key=lambda d: (sum(1 for v in d.values() if v), len(str(d.get("quote", "")))),
+        )
+        kept.append(best)
+    return kept
+
+
+async def extract_insights_llm(
+    article: MLHSArticle, runner: RateLimitedRunner, chunk_words: int = 900
+) -> tuple[List[NHLInsight], Counter]:
+    """Extract an article's insights; also returns summed token usage.
+
+    Raises if a chunk still fails after the runner's retries, so a partly
+    extracted article is never recorded as done.
+    """
+    chunks = article_chunks(article, chunk_words)
+    if not chunks:
+        return [], Counter()
+    results = await asyncio.gather(
+        *(
+            runner.run(_extract_chunk, article, c, i, len(chunks))
+            for i, c in enumerate(chunks, 1)
+        )
+    )
+    usage: Counter = sum((u for _, u in results), Counter())
+    data = merge_chunk_insights([d for items, _ in results for d in items])
     insights: List[NHLInsight] = []
     for d in data:
         if not d.get("id") or not isinstance(d["id"], str) or not d["id"].startswith("insight-"):
@@ -95,7 +153,81 @@ def extract_insights_llm(article: MLHSArticle) -> List[NHLInsight]:
             insights.append(NHLInsight(**d))
         except Exception:
             continue
-    return insights
+    return insights, usage
+
+
+async def process_articles(
+    articles: Iterable[MLHSArticle],
+    checkpoint: CheckpointStore,
+    runner: RateLimitedRunner,
+    concurrency: int = 4,
+    chunk_words: int = 900,
+) -> dict:
+    """Extract insights from ``articles`` with at most ``concurrency`` in flight.
+
+    Articles are pulled from the (lazy) iterable only as slots free up. Each
+    finished article is appended to ``checkpoint`` under its URL together with
+    its latency and token usage; failed articles are skipped and retried on
+    the next run. Returns totals for the run.
+    """
+    slots = asyncio.Semaphore(concurrency)
+    totals: Counter = Counter()
+    latencies: List[float] = []
+    tasks: Set[asyncio.Task] = set()
+
+    async def _one(article: MLHSArticle) -> None:
+        start = time.perf_counter()
+        try:
+            insights, usage = await extract_insights_llm(article, runner, chunk_words)
+        except Exception as e:
+            print(f"❌ {article.title}: {e}")
+            totals["failed"] += 1
+            return
+        latency = time.perf_counter() - start
+        checkpoint.put(
+            str(article.url),
+            {
+                "insights": [i.model_dump(mode="json") for i in insights],
+                "latency_s": round(latency, 2),
+                "usage": dict(usage),
+            },
+        )
+        latencies.append(latency)
+        totals.update(usage)
+        totals["articles"] += 1
+        totals["insights"] += len(insights)
+        print(
+            f"✨ {article.title}: {len(insights)} insights in {latency:.1f}s "
+            f"({usage['calls']} calls, {usage['cached_calls']} cached, "
+            f"{usage['prompt_tokens']}+{usage['completion_tokens']} tokens)"
+        )
+
+    for article in articles:
+        await slots.acquire()
+        task = asyncio.create_task(_one(article))
+        task.add_done_callback(lambda t: (slots.release(), tasks.discard(t)))
+        tasks.add(task)
+    await asyncio.gather(*tasks)
+
+    if latencies:
+        latencies.sort()
+        totals["latency_mean_s"] = round(sum(latencies) / len(latencies), 2)
+        totals["latency_p95_s"] = round(latencies[int(0.95 * (len(latencies) - 1))], 2)
+    return dict(totals)
+
+
+def write_insights(path: Path, existing: List[NHLInsight], checkpoint: CheckpointStore) -> int:
+    """Rewrite ``path`` from earlier output plus every checkpointed article."""
+    done = dict(checkpoint.items())
+    rows = [i.model_dump(mode="json") for i in existing if str(i.source_url) not in done]
+    for value in done.values():
+        rows.extend(value["insights"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2)
+    tmp.replace(path)
+    return len(rows)
 
 
 # ---------------------------------------------------------------------------
@@ -108,7 +240,10 @@ def main() -> None:
         description="Process MLHS articles for NHL insights"
     )
     parser.add_argument(
-        "--input", type=Path, default=Path("data/raw/mlhs_articles.json")
+        "--input",
+        type=Path,
+        default=Path("data/raw/mlhs_articles"),
+        help="Article store directory (a legacy mlhs_articles.json beside it is imported once)",
     )
     parser.add_argument(
         "--output", type=Path, default=Path("data/processed/mlhs_insights.json")
@@ -119,31 +254,71 @@ def main() -> None:
         default=0,
         help="Limit number of articles to process",
     )
+    parser.add_argument(
+        "--chunk-words",
+        type=int,
+        default=900,
+        help="Approximate words of article text per extraction call",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=Path("data/cache/mlhs_insights.jsonl"),
+        help="Per-article results appended as each article finishes; used to resume",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Articles processed concurrently"
+    )
+    parser.add_argument(
+        "--llm-concurrency", type=int, default=8, help="Maximum in-flight LLM calls"
+    )
+    parser.add_argument(
+        "--llm-rpm", type=float, help="Rate limit for LLM calls (requests per minute)"
+    )
+    parser.add_argument(
+        "--llm-retries", type=int, default=3, help="Retries per call with backoff"
+    )
     args = parser.parse_args()
 
-    articles = load_articles(args.input)
+    store = ArticleStore.for_output(args.input)
     existing, processed_urls = load_existing_insights(args.output)
+    checkpoint = CheckpointStore(args.checkpoint)
+    done_urls = {url for url, _ in checkpoint.items()}
     print(
-        f"✅ Loaded {len(articles)} articles; {len(existing)} insights already processed"
+        f"✅ Found {len(store)} articles; {len(existing)} insights already processed, "
+        f"{len(done_urls)} articles checkpointed"
     )
 
-    to_process = [a for a in articles if str(a.url) not in processed_urls]
+    # Stream only unprocessed articles instead of loading the whole archive
+    to_process = store.iter_articles(skip_urls=processed_urls | done_urls)
     if args.max_articles:
-        to_process = to_process[: args.max_articles]
-
-    new_insights: List[NHLInsight] = []
-    for art in to_process:
-        print(f"✨ Processing: {art.title}")
-        new_insights.extend(extract_insights_llm(art))
+        to_process = itertools.islice(to_process, args.max_articles)
 
-    all_insights = [i.model_dump(mode="json") for i in existing + new_insights]
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(all_insights, f, indent=2)
+    runner = RateLimitedRunner(
+        concurrency=args.llm_concurrency,
+        requests_per_minute=args.llm_rpm,
+        retries=args.llm_retries,
+    )
+    start = time.perf_counter()
+    totals = asyncio.run(
+        process_articles(to_process, checkpoint, runner, args.concurrency, args.chunk_words)
+    )
+    elapsed = time.perf_counter() - start
 
+    total = write_insights(args.output, existing, checkpoint)
     print(
-        f"✅ Wrote {len(new_insights)} new insights ({len(all_insights)} total) to {args.output}"
+        f"✅ Wrote {totals.get('insights', 0)} new insights ({total} total) to {args.output}"
     )
+    if totals.get("articles"):
+        print(
+            f"⏱️ {totals['articles']} articles in {elapsed:.1f}s "
+            f"(mean {totals['latency_mean_s']}s, p95 {totals['latency_p95_s']}s per article); "
+            f"{totals.get('prompt_tokens', 0)} prompt + {totals.get('completion_tokens', 0)} "
+            f"completion tokens over {totals.get('calls', 0)} calls"
+        )
+    if totals.get("failed"):
+        print(f"⚠️ {totals['failed']} articles failed; rerun to retry them")
+    print(llm.cache.report())
 
 
 if __name__ == "__main__":
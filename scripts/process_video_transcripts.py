@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
-"""Download YouTube video audio, transcribe with Whisper, summarize segments."""
+"""Download YouTube video audio, transcribe with Whisper, summarize segments.
+
+One download and one transcription per video feed every selected summarizer
+profile (``--profile hockey --profile dryland``), each writing its own clip set.
+"""
 import argparse
 import asyncio
 import json
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import Any, Callable, List, Dict, Set
 import csv
 import sys
 
@@ -14,14 +19,59 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 import yt_dlp
 from urllib.parse import urlparse, parse_qs
-import whisper
 
-from agents import Runner
+from agents import Agent, Runner
+from pydantic import BaseModel
 from app.client.agent.video_summarizer_agent import (
     video_summarizer_agent,
     VideoSummaryOutput,
 )
-from app.mcp_server.video_tools import get_video_metadata
+from app.client.agent.video_summarizer_dryland_agent import (
+    video_summarizer_dryland_agent,
+    VideoSummaryDrylandOutput,
+)
+from app.mcp_server.video_tools import get_video_metadata, get_videos_metadata
+from utils.transcription import AUDIO_CACHE_DIR, PRECISIONS, TranscriptCache, cached_audio
+from utils.clip_store import ClipStore
+from utils.rate_limit import RateLimitedRunner
+from utils.segmentation import segment_transcript
+from utils.video_pipeline import run_video_pipeline
+
+# video_id -> metadata dict, filled in batches by prefetch_metadata()
+_metadata_cache: dict[str, dict] = {}
+
+
+@dataclass(frozen=True)
+class SummarizerProfile:
+    """A summarizer agent plus the clip fields and output it produces."""
+
+    name: str
+    agent: Agent
+    output_type: type[BaseModel]
+    default_output: Path
+    # Profile-specific clip fields, e.g. hockey_skills vs training_focus
+    focus_fields: Callable[[Any], dict]
+    # Fixed clip_type for every clip, or None to use the agent's value
+    clip_type: str | None = None
+
+
+PROFILES: dict[str, SummarizerProfile] = {
+    "hockey": SummarizerProfile(
+        name="hockey",
+        agent=video_summarizer_agent,
+        output_type=VideoSummaryOutput,
+        default_output=Path("data/processed/video_clips.jsonl"),
+        focus_fields=lambda s: {"hockey_skills": s.hockey_skills},
+    ),
+    "dryland": SummarizerProfile(
+        name="dryland",
+        agent=video_summarizer_dryland_agent,
+        output_type=VideoSummaryDrylandOutput,
+        default_output=Path("data/processed/video_clips_dryland.jsonl"),
+        focus_fields=lambda s: {"training_focus": s.training_focus},
+        clip_type="off_ice_video",
+    ),
+}
 
 
 # --- Helpers ---
@@ -41,33 +91,63 @@ def parse_video_id(url: str) -> str | None:
     return None
 
 
-def download_audio(url: str, out_dir: Path) -> tuple[Path, dict]:
-    """Download audio using yt-dlp and return file path and video metadata."""
-    out_dir.mkdir(parents=True, exist_ok=True)
-    ydl_opts = {
-        "format": "bestaudio/best",
-        "outtmpl": str(out_dir / "%(id)s.%(ext)s"),
-        "quiet": True,
-    }
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=True)
-        filename = Path(ydl.prepare_filename(info))
+def _metadata_info(video_id: str, meta) -> dict:
+    info = meta.model_dump()
+    info["id"] = video_id
+    info["uploader"] = meta.author
+    return info
+
 
-    video_id = parse_video_id(url) or info.get("id")
+def prefetch_metadata(urls: List[str]) -> None:
+    """Resolve metadata for all URLs with batched ``videos.list`` calls."""
+    ids = [vid for vid in (parse_video_id(u) for u in urls) if vid and vid not in _metadata_cache]
+    if not ids:
+        return
     try:
-        meta = get_video_metadata(video_id)
-        info = meta.model_dump()
-        info["id"] = video_id
-        info["uploader"] = meta.author
+        found = get_videos_metadata(ids)
+    except Exception as e:
+        print(f"⚠️ Batch metadata lookup failed: {e}")
+        return
+    for vid, meta in found.items():
+        _metadata_cache[vid] = _metadata_info(vid, meta)
+    print(f"📇 Prefetched metadata for {len(found)}/{len(ids)} videos")
+
+
+def video_info(url: str, video_id: str | None = None) -> dict:
+    """Return cached (or freshly fetched) metadata for a video URL."""
+    video_id = video_id or parse_video_id(url)
+    if video_id in _metadata_cache:
+        return _metadata_cache[video_id]
+    try:
+        info = _metadata_info(video_id, get_video_metadata(video_id))
+        _metadata_cache[video_id] = info
     except Exception:
         info = {"id": video_id, "title": None, "uploader": None}
+    return info
+
 
-    return filename, info
+def download_audio(url: str, out_dir: Path = AUDIO_CACHE_DIR) -> tuple[Path, dict]:
+    """Download audio using yt-dlp and return file path and video metadata.
 
+    Audio already present in ``out_dir`` for the same video ID is reused.
+    """
+    video_id = parse_video_id(url)
+    filename = cached_audio(video_id, out_dir)
+    if filename is None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        ydl_opts = {
+            "format": "bestaudio/best",
+            "outtmpl": str(out_dir / "%(id)s.%(ext)s"),
+            "quiet": True,
+        }
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=True)
+            filename = Path(ydl.prepare_filename(info))
+        video_id = video_id or info.get("id")
+    else:
+        print(f"💾 Reusing cached audio {filename}")
 
-def transcribe_audio(audio_path: Path) -> dict:
-    model = whisper.load_model("base")
-    return model.transcribe(str(audio_path))
+    return filename, video_info(url, video_id)
 
 
 def group_segments(
@@ -110,48 +190,84 @@ def group_segments(
     return chunks
 
 
+def build_segmenter(
+    args: argparse.Namespace,
+) -> Callable[[List[dict]], List[Dict[str, float | str]]]:
+    """Return the transcript segmenter selected on the command line."""
+    if args.segmenter == "words":
+        return group_segments
+
+    embed = None
+    if args.topic_drift:
+        # Cached OpenAI embeddings shared with the Chroma indexers
+        from mcp_server.off_ice.chroma_utils import _embed as embed
+
+    def segment(segments: List[dict]) -> List[Dict[str, float | str]]:
+        return segment_transcript(
+            segments,
+            min_duration=args.min_segment_seconds,
+            target_duration=args.target_segment_seconds,
+            max_duration=args.max_segment_seconds,
+            pause_gap=args.pause_gap,
+            embed=embed,
+        )
+
+    return segment
+
+
 async def summarize_chunks(
-    chunks: List[Dict[str, float | str]], title: str
-) -> List[VideoSummaryOutput]:
-    results = []
-    for i, chunk in enumerate(chunks):
+    chunks: List[Dict[str, float | str]],
+    title: str,
+    runner: RateLimitedRunner,
+    profile: SummarizerProfile,
+) -> List[BaseModel | None]:
+    """Summarize chunks concurrently; the result list is aligned with ``chunks``.
+
+    A chunk whose summary still fails after retries yields ``None`` so later
+    summaries stay attached to their own timestamps.
+    """
+
+    async def _summarize(item: tuple[int, Dict[str, float | str]]) -> BaseModel:
+        i, chunk = item
         text = chunk["text"]
         print(
-            f"\n📝 Summarizing segment {i+1}/{len(chunks)} ({len(text.split())} words)..."
+            f"\n📝 [{profile.name}] Summarizing segment {i+1}/{len(chunks)} ({len(text.split())} words)..."
         )
         agent_input = f"Video Title: {title}\nTranscript Segment:\n{text}"
-        try:
-            run = await Runner.run(video_summarizer_agent, agent_input)
-            summary = run.final_output_as(VideoSummaryOutput)
-        except Exception as e:
-            print(f"❌ Agent call failed: {e}")
-            continue
-        print(f"✅ Segment {i+1} summarized")
+        run = await Runner.run(profile.agent, agent_input)
+        summary = run.final_output_as(profile.output_type)
+        print(f"✅ [{profile.name}] Segment {i+1} summarized")
         print(summary.model_dump_json(indent=2))
-        results.append(summary)
-    return results
+        return summary
 
+    return await runner.map(_summarize, list(enumerate(chunks)))
 
-async def process_video(url: str, output: Path, separate: bool = False, query_term: str = "") -> int:
-    """Process a single YouTube URL and write clips to disk.
 
-    If ``separate`` is True, ``output`` should be a folder and the JSON/CSV files
-    will be created inside it using ``video_id`` in the filename. Otherwise
-    ``output`` is treated as a combined JSON file.
+async def process_video(
+    url: str,
+    output: Path | ClipStore,
+    info: dict,
+    chunks: List[Dict[str, float | str]],
+    runner: RateLimitedRunner,
+    profile: SummarizerProfile,
+    query_term: str = "",
+) -> int:
+    """Summarize a segmented YouTube transcript with one profile and write its clips.
+
+    If ``output`` is a :class:`ClipStore` the clips are appended to it.
+    Otherwise ``output`` is a folder and JSON/CSV files are created inside it
+    using ``video_id`` in the filename.
     Returns the number of clips processed.
     """
-    tmp_dir = Path("tmp_video")
-    audio_path, info = download_audio(url, tmp_dir)
-    print(f"📥 Downloaded {audio_path}")
-    transcript = transcribe_audio(audio_path)
-    print("📜 Transcription complete")
-    chunks = group_segments(transcript.get("segments", []))
-    summaries = await summarize_chunks(chunks, info.get("title", ""))
+    summaries = await summarize_chunks(chunks, info.get("title", ""), runner, profile)
 
     video_id = info.get("id", "unknown")
 
     clips = []
     for idx, (s, chunk) in enumerate(zip(summaries, chunks)):
+        if s is None:
+            print(f"⚠️ Segment {idx+1} has no summary; skipping")
+            continue
         start_time = float(chunk.get("start", 0))
         end_time = float(chunk.get("end", start_time))
         position = s.position or []
@@ -173,20 +289,28 @@ async def process_video(url: str, output: Path, separate: bool = False, query_te
             "summary": s.summary,
             "teaching_points": s.teaching_points,
             "visual_prompt": s.visual_prompt,
-            "hockey_skills": s.hockey_skills,
+            **profile.focus_fields(s),
             "position": position,
             "complexity": s.complexity,
-            "clip_type": s.clip_type,
+            "clip_type": profile.clip_type or s.clip_type,
             "intended_audience": s.intended_audience,
             "play_or_skill_focus": s.play_or_skill_focus,
             "duration": round(end_time - start_time, 2),
             "transcript": chunk["text"],
         }
         clips.append(clip)
-    out_json = output
-    if separate:
-        output.mkdir(parents=True, exist_ok=True)
-        out_json = output / f"video_clips_{video_id}.json"
+    if not clips:
+        # Write nothing so the video is not marked processed and is retried
+        print(f"⚠️ [{profile.name}] No clips for {video_id}; not marking it processed")
+        return 0
+
+    if isinstance(output, ClipStore):
+        output.append(video_id, clips)
+        print(f"✅ [{profile.name}] Appended {len(clips)} clips to {output.path}")
+        return len(clips)
+
+    output.mkdir(parents=True, exist_ok=True)
+    out_json = output / f"video_clips_{video_id}.json"
 
     existing = []
     if out_json.exists():
@@ -199,18 +323,14 @@ async def process_video(url: str, output: Path, separate: bool = False, query_te
 
     # Bonus: also export CSV for spreadsheet users
     csv_path = out_json.with_suffix(".csv")
-    fieldnames = list(clips[0].keys()) if clips else []
-    if fieldnames:
-        if csv_path.exists():
-            with open(csv_path, "r", encoding="utf-8") as f:
-                pass  # ensure file exists for append
-        write_header = not csv_path.exists()
-        with open(csv_path, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if write_header:
-                writer.writeheader()
-            writer.writerows(clips)
-        print(f"✅ Appended clips to {csv_path}")
+    fieldnames = list(clips[0].keys())
+    write_header = not csv_path.exists()
+    with open(csv_path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        if write_header:
+            writer.writeheader()
+        writer.writerows(clips)
+    print(f"✅ Appended clips to {csv_path}")
 
     return len(clips)
 
@@ -255,45 +375,98 @@ async def run_all(args) -> None:
         print("No URLs provided. Use --url, --url-file or --url-list-folder.")
         return
 
+    profiles = [PROFILES[name] for name in dict.fromkeys(args.profile)]
     if args.combine_output:
         args.output = args.combine_output
+    if args.output and len(profiles) > 1:
+        print("--output/--combine-output need a single --profile; using profile defaults")
+        args.output = None
 
     separate = bool(args.output_folder)
-    output_path = args.output_folder if separate else args.output
-
-    processed_ids: Set[str] = set()
-    if not separate and output_path.exists():
-        try:
-            with open(output_path, "r", encoding="utf-8") as f:
-                existing = json.load(f)
-            for clip in existing:
-                vid = clip.get("video_id") or parse_video_id(clip.get("video_url", ""))
-                if vid:
-                    processed_ids.add(vid)
-        except Exception as e:
-            print(f"⚠️ Could not read existing clips from {output_path}: {e}")
-    if separate and args.output_folder and args.output_folder.exists():
-        for fpath in args.output_folder.glob("video_clips_*.json"):
-            vid = fpath.stem.replace("video_clips_", "")
-            processed_ids.add(vid)
+    outputs: dict[str, Path | ClipStore] = {}
+    processed: dict[str, Set[str]] = {}
+    for profile in profiles:
+        if separate:
+            folder = args.output_folder
+            if len(profiles) > 1:
+                folder = folder / profile.name
+            outputs[profile.name] = folder
+            processed[profile.name] = (
+                {f.stem.replace("video_clips_", "") for f in folder.glob("video_clips_*.json")}
+                if folder.exists()
+                else set()
+            )
+        else:
+            store = ClipStore.for_output(args.output or profile.default_output)
+            outputs[profile.name] = store
+            processed[profile.name] = store.processed_ids()
 
     summary = []
+    pending: list[tuple[str, str]] = []
+    # video_id (or url) -> profiles still to run for it
+    todo: dict[str, list[SummarizerProfile]] = {}
     for url, q_term in entries:
         vid = parse_video_id(url)
-        if not args.force and vid and vid in processed_ids:
+        key = vid or url
+        if key in todo:
+            continue
+        needed = [
+            p for p in profiles if args.force or not vid or vid not in processed[p.name]
+        ]
+        if not needed:
             print(f"⏭️  Skipping {url} (already processed)")
             summary.append((url, 0, "skipped"))
             continue
+        todo[key] = needed
+        pending.append((url, q_term))
+    prefetch_metadata([url for url, _ in pending])
+
+    # Shared by all videos so the LLM caps apply across the whole run
+    runner = RateLimitedRunner(
+        concurrency=args.llm_concurrency,
+        requests_per_minute=args.llm_rpm,
+        retries=args.llm_retries,
+    )
 
-        print(f"\n==== Processing {url} ====")
-        try:
-            count = await process_video(url, output_path, separate, q_term)
-            summary.append((url, count, None))
-            if vid:
-                processed_ids.add(vid)
-        except Exception as e:
-            print(f"❌ Failed to process {url}: {e}")
-            summary.append((url, 0, str(e)))
+    segment = build_segmenter(args)
+
+    async def finish(url: str, q_term: str, info: dict, transcript: dict) -> int:
+        needed = todo[parse_video_id(url) or url]
+        # Segment once; every profile summarizes the same chunks
+        chunks = await asyncio.to_thread(segment, transcript.get("segments", []))
+        print(
+            f"\n==== Summarizing {url} ({', '.join(p.name for p in needed)}; "
+            f"{len(chunks)} segments) ===="
+        )
+        counts = await asyncio.gather(
+            *(
+                process_video(url, outputs[p.name], info, chunks, runner, p, q_term)
+                for p in needed
+            )
+        )
+        return sum(counts)
+
+    summary += await run_video_pipeline(
+        pending,
+        download=download_audio,
+        finish=finish,
+        engine_options={
+            "model_name": args.whisper_model,
+            "threads": args.whisper_threads,
+            "precision": args.whisper_precision,
+        },
+        download_workers=args.download_workers,
+        transcribe_workers=args.transcribe_workers,
+        summarize_concurrency=args.summarize_concurrency,
+        transcript_cache=TranscriptCache(),
+        # Without a metadata lookup the pipeline skips cache reads but still writes
+        metadata=None if args.refresh_transcripts else video_info,
+    )
+
+    if not separate and any(count for _, count, err in summary if not err):
+        for store in outputs.values():
+            rows = store.export_csv()
+            print(f"✅ Exported {rows} clips to {store.csv_path}")
 
     print("\n--- Summary ---")
     for url, count, err in summary:
@@ -303,10 +476,16 @@ async def run_all(args) -> None:
             print(f"✅ {url} -> {count} clips")
 
 
-def main() -> None:
+def main(default_profiles: List[str] | None = None) -> None:
     parser = argparse.ArgumentParser(
         description="Process YouTube videos into transcripts and summaries"
     )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=sorted(PROFILES),
+        help="Summarizer profile to run (repeat to emit several clip sets in one pass; default hockey)",
+    )
     parser.add_argument(
         "--url", action="append", help="YouTube video URL (repeat for multiple)"
     )
@@ -328,8 +507,8 @@ def main() -> None:
     parser.add_argument(
         "--output",
         type=Path,
-        default=Path("data/processed/video_clips.json"),
-        help="Combined output JSON",
+        help="Combined JSON Lines clip store for a single profile "
+        "(default: the profile's store; a legacy .json file is imported once)",
     )
     parser.add_argument(
         "--output-folder",
@@ -340,14 +519,89 @@ def main() -> None:
         "--combine-output",
         type=Path,
         dest="combine_output",
-        help="Write all clips to this JSON file",
+        help="Write all clips to this clip store",
     )
     parser.add_argument(
         "--force",
         action="store_true",
         help="Reprocess videos even if already processed",
     )
+    parser.add_argument(
+        "--whisper-model", default="base", help="Whisper model size (tiny, base, small, ...)"
+    )
+    parser.add_argument(
+        "--whisper-threads", type=int, help="Torch CPU threads used by Whisper"
+    )
+    parser.add_argument(
+        "--whisper-precision",
+        choices=PRECISIONS,
+        default="fp32",
+        help="fp32 (CPU), fp16 (GPU) or int8 (quantized CPU)",
+    )
+    parser.add_argument(
+        "--download-workers", type=int, default=4, help="Concurrent yt-dlp downloads"
+    )
+    parser.add_argument(
+        "--transcribe-workers",
+        type=int,
+        default=1,
+        help="Whisper worker processes (0 = transcribe in-process)",
+    )
+    parser.add_argument(
+        "--summarize-concurrency",
+        type=int,
+        default=4,
+        help="Videos summarized concurrently",
+    )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=8,
+        help="Maximum in-flight segment summary calls across all videos",
+    )
+    parser.add_argument(
+        "--llm-rpm", type=float, help="Rate limit for summary calls (requests per minute)"
+    )
+    parser.add_argument(
+        "--llm-retries", type=int, default=3, help="Retries per segment with backoff"
+    )
+    parser.add_argument(
+        "--segmenter",
+        choices=["semantic", "words"],
+        default="semantic",
+        help="semantic: split at pauses, sentence ends and topic shifts; "
+        "words: fixed 80-word groups",
+    )
+    parser.add_argument(
+        "--min-segment-seconds", type=float, default=20.0, help="Shortest segment"
+    )
+    parser.add_argument(
+        "--target-segment-seconds",
+        type=float,
+        default=60.0,
+        help="Close a segment at the next sentence end once it is this long",
+    )
+    parser.add_argument(
+        "--max-segment-seconds", type=float, default=120.0, help="Longest segment"
+    )
+    parser.add_argument(
+        "--pause-gap",
+        type=float,
+        default=1.5,
+        help="Silence (seconds) between Whisper segments treated as a boundary",
+    )
+    parser.add_argument(
+        "--topic-drift",
+        action="store_true",
+        help="Also split where segment embeddings drift from the current segment",
+    )
+    parser.add_argument(
+        "--refresh-transcripts",
+        action="store_true",
+        help="Re-run Whisper even when a cached transcript exists",
+    )
     args = parser.parse_args()
+    args.profile = args.profile or default_profiles or ["hockey"]
 
     asyncio.run(run_all(args))
 
@@ -0,0 +1,163 @@
+"""Month-sharded, gzip-compressed store of crawled articles."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from models.mlhs_article import MLHSArticle
+
+INDEX_NAME = "index.json"
+
+
+class ArticleStore:
+    """Articles kept as one gzipped JSON Lines shard per publication month.
+
+    ``index.json`` maps each URL to its shard (``YYYY-MM.jsonl.gz``) and the
+    byte range of the gzip member holding it, so membership checks never
+    open a shard. Appending a crawl adds one gzip member to each affected
+    shard and then rewrites the small index; older shards are never touched.
+    Readers seek to each indexed member and decode one member at a time, so
+    memory stays bounded by a single append. The index is the commit point:
+    an article only counts once its URL is indexed, and a member torn by a
+    crash mid-append is never indexed or read, so it cannot hide articles
+    appended after it.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.index_path = self.root / INDEX_NAME
+        # url -> [shard, offset, length] of the gzip member holding it
+        self._index: dict[str, list] | None = None
+
+    @classmethod
+    def for_output(cls, path: Path) -> "ArticleStore":
+        """Open the store at ``path``, importing a legacy ``<path>.json`` once.
+
+        ``path`` may be the store directory or the old monolithic JSON file.
+        """
+        path = Path(path)
+        root = path.with_suffix("") if path.suffix == ".json" else path
+        store = cls(root)
+        legacy = root.with_suffix(".json")
+        if legacy.exists() and not store.index_path.exists():
+            store.import_legacy(legacy)
+        return store
+
+    def import_legacy(self, json_path: Path) -> None:
+        with open(json_path, "r", encoding="utf-8") as f:
+            articles = [MLHSArticle(**d) for d in json.load(f)]
+        added = self.append(articles)
+        print(f"📦 Imported {added} articles from {json_path} into {self.root}")
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    @property
+    def index(self) -> dict[str, list]:
+        if self._index is None:
+            self._index = {}
+            if self.index_path.exists():
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+        return self._index
+
+    def _save_index(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, separators=(",", ":"))
+        tmp.replace(self.index_path)
+
+    def __contains__(self, url: str) -> bool:
+        return str(url) in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def urls(self) -> set[str]:
+        return set(self.index)
+
+    @staticmethod
+    def shard_for(article: MLHSArticle) -> str:
+        return f"{article.published_date:%Y-%m}.jsonl.gz"
+
+    def shards(self) -> list[str]:
+        return sorted({shard for shard, _, _ in self.index.values()})
+
+    # ------------------------------------------------------------------
+    # Writes / reads
+    # ------------------------------------------------------------------
+
+    def append(self, articles: Iterable[MLHSArticle]) -> int:
+        """Add articles whose URL is not stored yet; returns how many were added."""
+        by_shard: dict[str, list[MLHSArticle]] = {}
+        seen: set[str] = set()
+        for article in articles:
+            url = str(article.url)
+            if url in self.index or url in seen:
+                continue
+            seen.add(url)
+            by_shard.setdefault(self.shard_for(article), []).append(article)
+        if not by_shard:
+            return 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        for shard, items in by_shard.items():
+            data = "".join(a.model_dump_json() + "\n" for a in items).encode("utf-8")
+            member = gzip.compress(data)
+            # Each append is a new gzip member, located by its byte range
+            with open(self.root / shard, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(member)
+                f.flush()
+                os.fsync(f.fileno())
+            for a in items:
+                self.index[str(a.url)] = [shard, offset, len(member)]
+        self._save_index()
+        return len(seen)
+
+    def _iter_member(self, shard: str, offset: int, length: int) -> Iterator[dict]:
+        path = self.root / shard
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = gzip.decompress(f.read(length))
+        except (EOFError, OSError, zlib.error) as e:
+            print(f"⚠️ Could not read member at {offset} in {path}: {e}")
+            return
+        for line in data.decode("utf-8").splitlines():
+            if line.strip():
+                yield json.loads(line)
+
+    def iter_articles(
+        self, skip_urls: set[str] | None = None, months: Iterable[str] | None = None
+    ) -> Iterator[MLHSArticle]:
+        """Stream stored articles shard by shard, oldest month first.
+
+        ``skip_urls`` filters before the article model is built, and
+        ``months`` (``"YYYY-MM"``) limits reading to those shards.
+        """
+        wanted = {f"{m}.jsonl.gz" for m in months} if months else None
+        members: dict[str, set[tuple[int, int]]] = {}
+        for shard, offset, length in self.index.values():
+            members.setdefault(shard, set()).add((offset, length))
+
+        for shard in self.shards():
+            if wanted is not None and shard not in wanted:
+                continue
+            for offset, length in sorted(members[shard]):
+                loc = [shard, offset, length]
+                for data in self._iter_member(shard, offset, length):
+                    url = data.get("url")
+                    # Only the copy the index points at is committed
+                    if self.index.get(url) != loc:
+                        continue
+                    if skip_urls and url in skip_urls:
+                        continue
+                    yield MLHSArticle(**data)
@@ -0,0 +1,67 @@
+"""Append-only JSON Lines checkpoint store for resumable batch jobs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterator
+
+
+def content_key(*parts: Any) -> str:
+    """Short stable hash of ``parts``, used to tie a checkpoint to its input."""
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """Completed work items keyed by string, persisted one JSON line per item.
+
+    ``put`` appends and flushes immediately, so a crash loses at most the item
+    being written; a torn final line is ignored on load. A later ``put`` for
+    the same key wins. Keys should include a hash of the item's input (see
+    :func:`content_key`) so changed inputs are recomputed rather than reused.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._items: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._items[entry["key"]] = entry["value"]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._items.get(key, default)
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        return iter(list(self._items.items()))
+
+    def put(self, key: str, value: Any) -> None:
+        line = json.dumps({"key": key, "value": value}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._items[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items = {}
+            if self.path.exists():
+                self.path.unlink()
@@ -0,0 +1,127 @@
+"""Append-only JSON Lines store for video clips."""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+
+class ClipStore:
+    """Clips kept as JSON Lines with a manifest of committed writes.
+
+    Adding a video appends its clips to ``<name>.jsonl`` and then records the
+    byte range written in ``<name>.manifest``. Only ranges listed in the
+    manifest are read back, and a later write for the same video replaces the
+    earlier one, so a crash mid-append or a ``--force`` re-run never yields
+    partial or duplicate clips. Appending video N+1 costs O(its clips), and
+    listing processed videos only reads the small manifest. The CSV companion
+    is regenerated from committed clips by ``export_csv`` so it cannot drift.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.manifest_path = self.path.with_suffix(".manifest")
+        self.csv_path = self.path.with_suffix(".csv")
+
+    @classmethod
+    def for_output(cls, output: Path) -> "ClipStore":
+        """Open the store for ``output``, importing a legacy ``.json`` file once."""
+        output = Path(output)
+        store = cls(output.with_suffix(".jsonl"))
+        legacy = output.with_suffix(".json")
+        if legacy.exists() and not store.manifest_path.exists():
+            store.import_legacy(legacy)
+        return store
+
+    def import_legacy(self, json_path: Path) -> None:
+        with open(json_path, "r", encoding="utf-8") as f:
+            clips = json.load(f)
+        by_video: dict[str, List[dict]] = {}
+        for clip in clips:
+            by_video.setdefault(str(clip.get("video_id") or "unknown"), []).append(clip)
+        for video_id, video_clips in by_video.items():
+            self.append(video_id, video_clips)
+        print(f"📦 Imported {len(clips)} clips from {json_path} into {self.path}")
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _entries(self) -> dict[str, dict]:
+        """Latest committed manifest entry per video."""
+        entries: dict[str, dict] = {}
+        if not self.manifest_path.exists():
+            return entries
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line from an interrupted write
+                entries[entry["video_id"]] = entry
+        return entries
+
+    def processed_ids(self) -> set[str]:
+        """Videos with committed clips; empty writes are retried, not skipped."""
+        return {video_id for video_id, entry in self._entries().items() if entry.get("clips")}
+
+    # ------------------------------------------------------------------
+    # Writes / reads
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _append_durably(path: Path, data: bytes) -> int:
+        """Append ``data`` and fsync; return the offset it was written at."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return offset
+
+    def append(self, video_id: str, clips: List[dict]) -> None:
+        """Append one video's clips, then commit them in the manifest."""
+        data = "".join(json.dumps(c, ensure_ascii=False) + "\n" for c in clips).encode("utf-8")
+        offset = self._append_durably(self.path, data)
+        entry = {
+            "video_id": video_id,
+            "offset": offset,
+            "length": len(data),
+            "clips": len(clips),
+            "written_at": time.time(),
+        }
+        self._append_durably(self.manifest_path, (json.dumps(entry) + "\n").encode("utf-8"))
+
+    def iter_clips(self) -> Iterator[dict]:
+        """Stream committed clips, one video's latest write at a time."""
+        entries = sorted(self._entries().values(), key=lambda e: e["offset"])
+        if not entries:
+            return
+        with open(self.path, "rb") as f:
+            for entry in entries:
+                f.seek(entry["offset"])
+                for line in f.read(entry["length"]).splitlines():
+                    if line.strip():
+                        yield json.loads(line)
+
+    def export_csv(self) -> int:
+        """Rewrite the CSV companion from committed clips; returns rows written."""
+        rows = 0
+        fieldnames: List[str] | None = None
+        tmp = self.csv_path.with_suffix(".csv.tmp")
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer: csv.DictWriter | None = None
+            for clip in self.iter_clips():
+                if writer is None:
+                    fieldnames = list(clip.keys())
+                    writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+                    writer.writeheader()
+                writer.writerow(clip)
+                rows += 1
+        tmp.replace(self.csv_path)
+        return rows
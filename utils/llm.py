@@ -0,0 +1,225 @@
+"""Chat completion calls with a shared, disk-backed response cache."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+DEFAULT_MODEL = "gpt-3.5-turbo-0125"
+LLM_CACHE_PATH = Path(
+    os.getenv(
+        "LLM_CACHE_PATH",
+        Path(__file__).resolve().parent.parent / "data" / "cache" / "llm_responses.sqlite",
+    )
+)
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def cache_key(model: str, system: str, user: str, **params: Any) -> str:
+    """Key on model, system prompt hash, user content hash and call parameters."""
+    raw = json.dumps(
+        {"model": model, "system": _sha(system), "user": _sha(user), "params": params},
+        sort_keys=True,
+    )
+    return _sha(raw)
+
+
+@dataclass
+class LLMResponse:
+    content: str
+    usage: dict = field(default_factory=dict)
+    cached: bool = False
+    model: str = DEFAULT_MODEL
+
+
+class ResponseCache:
+    """SQLite store of completions shared by every extraction script.
+
+    Rows are evicted least-recently-used first once the stored content
+    exceeds ``max_bytes``. ``hits``/``misses`` count lookups in this process.
+    """
+
+    def __init__(self, path: Path = LLM_CACHE_PATH, max_bytes: int = LLM_CACHE_MAX_BYTES) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, model TEXT NOT NULL, content TEXT NOT NULL,"
+                " usage TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> LLMResponse | None:
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT model, content, usage FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+            self.hits += 1
+        model, content, usage = row
+        usage = json.loads(usage)
+        self.saved_tokens += int(usage.get("total_tokens") or 0)
+        return LLMResponse(content=content, usage=usage, cached=True, model=model)
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        now = time.time()
+        size = len(response.content.encode("utf-8"))
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, model, content, usage, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, response.model, response.content, json.dumps(response.usage), size, now, now),
+            )
+            self._evict(db)
+            db.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        (total,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        doomed = []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed ASC"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def report(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return (
+            f"🗄️ LLM cache: {self.hits} hits, {self.misses} misses ({rate:.0%} hit rate), "
+            f"~{self.saved_tokens} tokens saved"
+        )
+
+
+_shared_cache: ResponseCache | None = None
+
+
+def shared_cache() -> ResponseCache:
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ResponseCache()
+    return _shared_cache
+
+
+class LLM:
+    """Thin wrapper over OpenAI chat completions with response caching.
+
+    ``chat`` and ``achat`` send one system and one user message and return an
+    :class:`LLMResponse`. Identical calls (same model, prompts and parameters)
+    are answered from the cache. Pass ``use_cache=False`` or set
+    ``LLM_CACHE=off`` to always call the API; fresh responses are still stored.
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        temperature: float = 0,
+        cache: ResponseCache | None = None,
+        use_cache: bool | None = None,
+    ) -> None:
+        self.model = model
+        self.temperature = temperature
+        self.cache = cache or shared_cache()
+        if use_cache is None:
+            use_cache = os.getenv("LLM_CACHE", "on").lower() not in {"0", "off", "false"}
+        self.use_cache = use_cache
+        self._client = None
+        self._aclient = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import OpenAI
+
+            self._client = OpenAI()
+        return self._client
+
+    @property
+    def aclient(self):
+        if self._aclient is None:
+            from openai import AsyncOpenAI
+
+            self._aclient = AsyncOpenAI()
+        return self._aclient
+
+    def _request(self, system: str, user: str, params: dict) -> tuple[str, dict]:
+        kwargs = {"model": self.model, "temperature": self.temperature, **params}
+        key = cache_key(self.model, system, user, temperature=self.temperature, **params)
+        kwargs["messages"] = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ]
+        return key, kwargs
+
+    def _response(self, resp) -> LLMResponse:
+        usage = resp.usage.model_dump() if getattr(resp, "usage", None) else {}
+        return LLMResponse(
+            content=resp.choices[0].message.content or "",
+            usage=usage,
+            cached=False,
+            model=self.model,
+        )
+
+    def chat(self, system: str, user: str, **params: Any) -> LLMResponse:
+        key, kwargs = self._request(system, user, params)
+        if self.use_cache and (hit := self.cache.get(key)):
+            return hit
+        result = self._response(self.client.chat.completions.create(**kwargs))
+        self.cache.put(key, result)
+        return result
+
+    async def achat(self, system: str, user: str, **params: Any) -> LLMResponse:
+        key, kwargs = self._request(system, user, params)
+        if self.use_cache and (hit := self.cache.get(key)):
+            return hit
+        result = self._response(await self.aclient.chat.completions.create(**kwargs))
+        self.cache.put(key, result)
+        return result
+
+    def forget(self, system: str, user: str, **params: Any) -> None:
+        """Drop the cached response for this call, e.g. one that failed to parse."""
+        key, _ = self._request(system, user, params)
+        self.cache.delete(key)
@@ -0,0 +1,131 @@
+"""MinHash/LSH near-duplicate clustering shared by the extraction pipelines."""
+
+from __future__ import annotations
+
+import re
+import zlib
+from typing import List, Sequence
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).strip()
+
+
+def shingles(text: str, k: int = 3) -> set[str]:
+    """Character ``k``-grams of the normalized text (the whole text if shorter)."""
+    norm = normalize_text(text)
+    if len(norm) <= k:
+        return {norm} if norm else set()
+    return {norm[i : i + k] for i in range(len(norm) - k + 1)}
+
+
+class MinHasher:
+    """MinHash signatures using vectorized multiply-shift hash permutations."""
+
+    def __init__(self, num_perm: int = 128, k: int = 3, seed: int = 1) -> None:
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.k = k
+        # Odd multipliers make each (a * h + b) >> 32 a distinct permutation
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        grams = shingles(text, self.k)
+        if not grams:
+            # Every empty text gets the same signature, i.e. they match each other
+            return np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        hashes = np.fromiter(
+            (zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams)
+        )
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(self._a, hashes) + self._b[:, None]) >> np.uint64(32)
+        return permuted.min(axis=1)
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.num_perm), dtype=np.uint64)
+        return np.vstack([self.signature(t) for t in texts])
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int, max_bucket: int = 32) -> np.ndarray:
+    """Pairs ``(i, j)`` with ``i < j`` sharing at least one LSH band bucket.
+
+    Buckets of up to ``max_bucket`` members yield every pair. Larger buckets,
+    e.g. many near-identical short texts, only pair each member with the
+    bucket's first member, so the work stays linear in the bucket size
+    instead of quadratic; members are still joined through that hub.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    found: List[np.ndarray] = []
+    for band in range(bands):
+        chunk = np.ascontiguousarray(signatures[:, band * rows : (band + 1) * rows])
+        _, labels = np.unique(chunk, axis=0, return_inverse=True)
+        labels = labels.ravel()
+        order = np.argsort(labels, kind="stable")
+        sorted_labels = labels[order]
+        # Boundaries of runs of equal labels, i.e. buckets
+        starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]])
+        ends = np.r_[starts[1:], n]
+        for s, e in zip(starts, ends):
+            size = e - s
+            if size < 2:
+                continue
+            members = np.sort(order[s:e])
+            if size <= max_bucket:
+                x, y = np.triu_indices(size, k=1)
+                found.append(np.column_stack((members[x], members[y])))
+            else:
+                found.append(
+                    np.column_stack((np.full(size - 1, members[0]), members[1:]))
+                )
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.unique(np.vstack(found).astype(np.int64), axis=0)
+
+
+def near_duplicate_clusters(
+    texts: Sequence[str],
+    threshold: float = 0.8,
+    k: int = 3,
+    num_perm: int = 128,
+    bands: int = 32,
+) -> List[List[int]]:
+    """Cluster ``texts`` whose estimated Jaccard similarity is at least ``threshold``.
+
+    Texts are shingled into character ``k``-grams and MinHashed; LSH banding
+    proposes candidate pairs, so only texts sharing a bucket are scored, and
+    candidate similarities are computed in one vectorized pass. Clusters are
+    the connected components of pairs at or above ``threshold``. Every index
+    appears in exactly one cluster (singletons included); clusters are ordered
+    by their first member and members are ascending.
+    """
+    n = len(texts)
+    if n < 2:
+        return [[i] for i in range(n)]
+
+    sigs = MinHasher(num_perm=num_perm, k=k).signatures(texts)
+    pairs = candidate_pairs(sigs, bands)
+
+    parent = list(range(n))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    if len(pairs):
+        sims = (sigs[pairs[:, 0]] == sigs[pairs[:, 1]]).mean(axis=1)
+        for i, j in pairs[sims >= threshold]:
+            ri, rj = find(int(i)), find(int(j))
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+    clusters: dict[int, List[int]] = {}
+    for i in range(n):
+        clusters.setdefault(find(i), []).append(i)
+    return sorted(clusters.values(), key=lambda c: c[0])
@@ -0,0 +1,174 @@
+"""Pooled, rate-limited HTTP fetching with conditional GETs for crawlers."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    text: str | None  # None when the server answered 304 Not Modified
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+class ValidatorStore:
+    """ETag/Last-Modified validators per URL, persisted as one JSON file.
+
+    Validators are not recorded by the fetch itself: callers ``update`` a URL
+    once whatever they derived from its body is safely stored, so a later
+    304 never hides content that was lost.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except Exception:
+                self._data = {}
+
+    def headers_for(self, url: str) -> dict:
+        entry = self._data.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url: str, result: FetchResult) -> None:
+        if not (result.etag or result.last_modified):
+            return
+        with self._lock:
+            self._data[url] = {"etag": result.etag, "last_modified": result.last_modified}
+
+    def forget(self, url: str) -> None:
+        with self._lock:
+            self._data.pop(url, None)
+
+    def save(self) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            tmp.replace(self.path)
+
+
+class _HostGate:
+    """Per-host concurrency cap plus a minimum spacing between request starts."""
+
+    def __init__(self, max_concurrency: int, requests_per_second: float | None) -> None:
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def __enter__(self) -> "_HostGate":
+        self.slots.acquire()
+        if self.interval:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next)
+                self._next = start + self.interval
+            if start > now:
+                time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.slots.release()
+
+
+class PoliteSession:
+    """Thread-safe fetcher sharing one pooled ``requests.Session``.
+
+    Each host gets at most ``max_per_host`` requests in flight and at most
+    ``requests_per_second`` request starts. With a :class:`ValidatorStore`,
+    ``get(..., conditional=True)`` sends If-None-Match/If-Modified-Since so
+    unchanged pages come back as bodiless 304s; new validators are returned
+    on the :class:`FetchResult` for the caller to commit. Transient 429/5xx
+    responses are retried with backoff by the connection adapter.
+    """
+
+    def __init__(
+        self,
+        headers: dict | None = None,
+        max_per_host: int = 6,
+        requests_per_second: float | None = 10.0,
+        validators: ValidatorStore | None = None,
+        timeout: float = 30.0,
+    ) -> None:
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(max_per_host, 10), max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.max_per_host = max_per_host
+        self.requests_per_second = requests_per_second
+        self.validators = validators
+        self.timeout = timeout
+        self.stats: Counter[str] = Counter()
+        self._stats_lock = threading.Lock()
+        self._gates: dict[str, _HostGate] = {}
+        self._gates_lock = threading.Lock()
+
+    def _gate(self, url: str) -> _HostGate:
+        host = urlparse(url).netloc
+        with self._gates_lock:
+            if host not in self._gates:
+                self._gates[host] = _HostGate(self.max_per_host, self.requests_per_second)
+            return self._gates[host]
+
+    def get(self, url: str, conditional: bool = False) -> FetchResult:
+        headers = self.validators.headers_for(url) if conditional and self.validators else {}
+        with self._gate(url):
+            resp = self.session.get(url, headers=headers, timeout=self.timeout)
+        not_modified = resp.status_code == 304
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["not_modified"] += not_modified
+        if not_modified:
+            return FetchResult(url, 304, None)
+        resp.raise_for_status()
+        with self._stats_lock:
+            self.stats["bytes"] += len(resp.content)
+        return FetchResult(
+            url,
+            resp.status_code,
+            resp.text,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+
+    def close(self) -> None:
+        if self.validators:
+            self.validators.save()
+        self.session.close()
@@ -0,0 +1,105 @@
+"""Concurrency, rate limiting and retry helpers for async LLM calls."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class TokenBucket:
+    """Async token bucket allowing ``rate_per_minute`` requests with bursts up to ``capacity``."""
+
+    def __init__(self, rate_per_minute: float, capacity: int | None = None) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity or max(1, int(rate_per_minute // 6)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Return the server's Retry-After hint (seconds) if the error carries one."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedRunner:
+    """Run async calls under a concurrency cap, a token bucket and retry with backoff.
+
+    One runner is meant to be shared by every caller in a process so the caps
+    apply globally rather than per video or per document.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        requests_per_minute: float | None = None,
+        retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ) -> None:
+        self._sem = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    async def run(self, fn: Callable[..., Awaitable[R]], *args: Any, **kwargs: Any) -> R:
+        """Call ``fn`` with retries; re-raises the last error once retries run out."""
+        attempt = 0
+        while True:
+            async with self._sem:
+                if self._bucket:
+                    await self._bucket.acquire()
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception as e:
+                    if attempt >= self.retries:
+                        raise
+                    delay = _retry_after(e) or min(
+                        self.max_delay, self.base_delay * 2**attempt
+                    )
+                    delay *= 1 + random.random() * 0.25
+                    print(f"⚠️ Call failed ({e}); retry {attempt + 1}/{self.retries} in {delay:.1f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def map(
+        self, fn: Callable[[T], Awaitable[R]], items: Iterable[T]
+    ) -> list[R | None]:
+        """Run ``fn`` over ``items`` concurrently, preserving order.
+
+        A call that still fails after retries yields ``None`` in its slot, so
+        results stay aligned with their inputs.
+        """
+
+        async def _one(item: T) -> R | None:
+            try:
+                return await self.run(fn, item)
+            except Exception as e:
+                print(f"❌ Call failed after {self.retries} retries: {e}")
+                return None
+
+        return list(await asyncio.gather(*(_one(it) for it in items)))
@@ -0,0 +1,130 @@
+"""Pause-, sentence- and topic-aware grouping of Whisper segments."""
+
+from __future__ import annotations
+
+import math
+
+from typing import Callable, Dict, List, Sequence
+
+EmbedFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+SENTENCE_ENDINGS = (".", "!", "?", "…")
+
+
+def _chunk(segs: List[dict]) -> Dict[str, float | str]:
+    return {
+        "text": " ".join(s["text"].strip() for s in segs).strip(),
+        "start": float(segs[0].get("start", 0)),
+        "end": float(segs[-1].get("end", segs[-1].get("start", 0))),
+    }
+
+
+def _add(a, b) -> List[float]:
+    return [x + y for x, y in zip(a, b)]
+
+
+def _cosine(a, b) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    denom = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / denom if denom else 1.0
+
+
+def segment_transcript(
+    segments: List[dict],
+    min_duration: float = 20.0,
+    target_duration: float = 60.0,
+    max_duration: float = 120.0,
+    max_words: int = 350,
+    pause_gap: float = 1.5,
+    embed: EmbedFn | None = None,
+    drift_threshold: float = 0.8,
+) -> List[Dict[str, float | str]]:
+    """Group Whisper segments into chunks that follow the speaker's structure.
+
+    A chunk may only end at a sentence end or a pause. Once it is at least
+    ``min_duration`` long, it ends at a pause of ``pause_gap`` seconds, at a
+    topic shift (cosine similarity between the chunk and the next segment
+    below ``drift_threshold``, only when ``embed`` is given), or at the first
+    sentence end past ``target_duration``. When the next segment would push
+    it over ``max_duration`` or ``max_words``, it is cut at its last sentence
+    end instead of mid-thought. A short trailing chunk is folded into the
+    previous one when that still fits.
+    """
+    segs = [s for s in segments if s.get("text", "").strip()]
+    if not segs:
+        return []
+
+    vectors = None
+    if embed is not None:
+        try:
+            vectors = list(embed([s["text"].strip() for s in segs]))
+        except Exception as e:
+            print(f"⚠️ Embedding drift disabled for this video: {e}")
+            vectors = None
+
+    def duration(group: List[int]) -> float:
+        return float(segs[group[-1]].get("end", 0)) - float(segs[group[0]].get("start", 0))
+
+    def words(group: List[int]) -> int:
+        return sum(len(segs[i]["text"].split()) for i in group)
+
+    groups: List[List[int]] = []
+    current: List[int] = []
+    last_sentence_end: int | None = None  # position within ``current``
+    centroid = None
+
+    for i, seg in enumerate(segs):
+        if current:
+            prospective = current + [i]
+            if duration(prospective) > max_duration or words(prospective) > max_words:
+                cut = len(current)
+                if last_sentence_end is not None and duration(current[: last_sentence_end + 1]) >= min_duration:
+                    cut = last_sentence_end + 1
+                groups.append(current[:cut])
+                current = current[cut:]
+                last_sentence_end = None
+                centroid = None
+                if vectors is not None and current:
+                    centroid = list(vectors[current[0]])
+                    for j in current[1:]:
+                        centroid = _add(centroid, vectors[j])
+
+        current.append(i)
+        if vectors is not None:
+            centroid = vectors[i] if centroid is None else _add(centroid, vectors[i])
+
+        text = seg["text"].strip()
+        is_sentence_end = text.endswith(SENTENCE_ENDINGS)
+        if is_sentence_end:
+            last_sentence_end = len(current) - 1
+
+        nxt = segs[i + 1] if i + 1 < len(segs) else None
+        if nxt is None:
+            break
+        gap = float(nxt.get("start", 0)) - float(seg.get("end", 0))
+        if not (is_sentence_end or gap >= pause_gap):
+            continue
+        dur = duration(current)
+        if dur < min_duration:
+            continue
+        drift = (
+            vectors is not None
+            and centroid is not None
+            and _cosine(centroid, vectors[i + 1]) < drift_threshold
+        )
+        if gap >= pause_gap or drift or (is_sentence_end and dur >= target_duration):
+            groups.append(current)
+            current = []
+            last_sentence_end = None
+            centroid = None
+
+    if current:
+        if groups and duration(current) < min_duration:
+            merged = groups[-1] + current
+            if duration(merged) <= max_duration and words(merged) <= max_words:
+                groups[-1] = merged
+                current = []
+        if current:
+            groups.append(current)
+
+    return [_chunk([segs[i] for i in g]) for g in groups]
@@ -0,0 +1,106 @@
+"""HTML-to-text cleanup and quote-preserving chunking for LLM extraction."""
+
+from __future__ import annotations
+
+import re
+from typing import List
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+
+BLOCK_TAGS = ["p", "blockquote", "li", "h1", "h2", "h3", "h4", "h5", "h6", "pre", "div", "ul", "ol", "table", "tr", "td", "th", "section", "article"]
+QUOTE_CHARS = re.compile(r"[\"“”]")
+SENTENCE_END = re.compile(r"(?<=[.!?…])[\"”’)]*\s+")
+
+
+def html_to_paragraphs(html: str) -> List[str]:
+    """Strip markup to clean paragraphs, keeping quotation marks intact.
+
+    Scripts, styles, embeds and share widgets are dropped. Each block (and
+    any loose text in a container such as a ``<div>``) contributes its own
+    text, with nested blocks emitted separately after it, so nothing is lost
+    or repeated. Block quotes are prefixed with ``> `` so the model can tell
+    pulled quotes from narration.
+    """
+    soup = BeautifulSoup(html or "", "html.parser")
+    for tag in soup(["script", "style", "noscript", "iframe", "figure", "svg", "form"]):
+        tag.decompose()
+
+    paragraphs: List[str] = []
+
+    def _emit(parts: List[str], quoted: bool) -> None:
+        text = re.sub(r"\s+", " ", " ".join(parts)).strip()
+        if text:
+            paragraphs.append(f"> {text}" if quoted else text)
+
+    def _walk(node: Tag, quoted: bool) -> None:
+        # Text directly inside ``node``, up to the next nested block
+        parts: List[str] = []
+        for child in node.children:
+            if isinstance(child, Tag) and (child.name in BLOCK_TAGS or child.find(BLOCK_TAGS)):
+                _emit(parts, quoted)
+                parts = []
+                _walk(child, quoted or child.name == "blockquote")
+            elif isinstance(child, Tag):
+                parts.append(child.get_text(" ", strip=True))
+            elif isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
+                parts.append(str(child))
+        _emit(parts, quoted)
+
+    _walk(soup, False)
+    return paragraphs
+
+
+def _split_long(paragraph: str, max_words: int) -> List[str]:
+    """Split an oversize paragraph at sentence ends that fall outside quotes."""
+    pieces: List[str] = []
+    current = ""
+    start = 0
+    for match in SENTENCE_END.finditer(paragraph):
+        sentence = paragraph[start : match.end()]
+        candidate = current + sentence
+        inside_quote = len(QUOTE_CHARS.findall(candidate)) % 2 == 1
+        start = match.end()
+        if len(candidate.split()) >= max_words and not inside_quote:
+            pieces.append(candidate.strip())
+            current = ""
+        else:
+            current = candidate
+    current += paragraph[start:]
+    if current.strip():
+        pieces.append(current.strip())
+    return pieces
+
+
+def chunk_paragraphs(
+    paragraphs: List[str], max_words: int = 900, overlap_paragraphs: int = 1
+) -> List[str]:
+    """Pack paragraphs into chunks of about ``max_words`` words.
+
+    Chunks break only between paragraphs (or, for a single oversize
+    paragraph, between sentences outside quotation marks) so a quote is never
+    cut in half. Each chunk repeats the last ``overlap_paragraphs`` paragraphs
+    of the previous one, keeping a question next to its answer across a
+    boundary.
+    """
+    units: List[str] = []
+    for p in paragraphs:
+        units.extend(_split_long(p, max_words) if len(p.split()) > max_words else [p])
+
+    chunks: List[str] = []
+    current: List[str] = []
+    words = 0
+    for unit in units:
+        n = len(unit.split())
+        if current and words + n > max_words:
+            chunks.append("\n\n".join(current))
+            current = current[-overlap_paragraphs:] if overlap_paragraphs else []
+            words = sum(len(u.split()) for u in current)
+            # An overlap that alone fills the chunk would repeat forever
+            if words + n > max_words:
+                current, words = [], 0
+        current.append(unit)
+        words += n
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
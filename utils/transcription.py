@@ -0,0 +1,174 @@
+"""Long-lived Whisper transcription engine shared by the video pipelines."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+PRECISIONS = ("fp32", "fp16", "int8")
+
+CACHE_ROOT = Path(__file__).resolve().parent.parent / "data" / "cache"
+AUDIO_CACHE_DIR = CACHE_ROOT / "audio"
+TRANSCRIPT_CACHE_DIR = CACHE_ROOT / "transcripts"
+
+
+class TranscriptionEngine:
+    """Load a Whisper model once and reuse it for every transcription.
+
+    ``precision`` selects fp32 (CPU default), fp16 (GPU) or int8, which applies
+    dynamic quantization to the model's linear layers for faster CPU decoding.
+    ``threads`` caps the torch intra-op thread pool.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "base",
+        threads: int | None = None,
+        precision: str = "fp32",
+        device: str | None = None,
+    ) -> None:
+        if precision not in PRECISIONS:
+            raise ValueError(f"precision must be one of {PRECISIONS}, got {precision!r}")
+        self.model_name = model_name
+        self.threads = threads
+        self.precision = precision
+        self.device = device
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def options(self) -> dict:
+        """Settings that affect transcript output."""
+        return {"model": self.model_name, "precision": self.precision}
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+        return self._model
+
+    def _load(self):
+        import torch
+        import whisper
+
+        if self.threads:
+            torch.set_num_threads(self.threads)
+        device = self.device
+        if self.precision == "int8":
+            # Dynamic quantization only runs on CPU
+            device = "cpu"
+        print(f"🧠 Loading Whisper model '{self.model_name}' ({self.precision})...")
+        model = whisper.load_model(self.model_name, device=device)
+        if self.precision == "int8":
+            model = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        return model
+
+    def transcribe(self, audio_path: Path) -> dict:
+        return self.model.transcribe(str(audio_path), fp16=self.precision == "fp16")
+
+
+# ---------------------------------------------------------------------------
+# Process-pool helpers: each worker process holds one engine
+# ---------------------------------------------------------------------------
+
+_worker_engine: TranscriptionEngine | None = None
+
+
+def init_worker_engine(options: dict) -> None:
+    """``ProcessPoolExecutor`` initializer that loads the model in the worker."""
+    global _worker_engine
+    _worker_engine = TranscriptionEngine(**options)
+    _ = _worker_engine.model
+
+
+def transcribe_file(audio_path: Path) -> dict:
+    """Transcribe with the worker's engine, keeping only picklable fields."""
+    if _worker_engine is None:
+        raise RuntimeError("init_worker_engine() has not run in this process")
+    result = _worker_engine.transcribe(audio_path)
+    return {
+        "text": result.get("text", ""),
+        "language": result.get("language"),
+        "segments": [
+            {"start": float(s["start"]), "end": float(s["end"]), "text": s["text"]}
+            for s in result.get("segments", [])
+        ],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Transcript cache
+# ---------------------------------------------------------------------------
+
+
+class TranscriptCache:
+    """Content-addressed store of Whisper transcripts.
+
+    Entries are keyed on ``(video_id, transcription options)`` so switching
+    summarizer prompts or pipelines reuses the same transcript, while a
+    different model or precision gets its own entry. Segments are stored as
+    gzipped ``[start, end, text]`` triples.
+    """
+
+    def __init__(self, root: Path = TRANSCRIPT_CACHE_DIR) -> None:
+        self.root = Path(root)
+
+    @staticmethod
+    def key(video_id: str, options: dict) -> str:
+        raw = json.dumps({"video_id": video_id, **options}, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, video_id: str, options: dict) -> Path:
+        key = self.key(video_id, options)
+        return self.root / key[:2] / f"{key}.json.gz"
+
+    def get(self, video_id: str, options: dict) -> dict | None:
+        path = self._path(video_id, options)
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        segments = [{"start": s, "end": e, "text": t} for s, e, t in data["segments"]]
+        return {
+            "text": "".join(seg["text"] for seg in segments),
+            "language": data.get("language"),
+            "segments": segments,
+        }
+
+    def put(self, video_id: str, options: dict, transcript: dict) -> None:
+        path = self._path(video_id, options)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "video_id": video_id,
+            "options": options,
+            "language": transcript.get("language"),
+            "segments": [
+                [round(float(s["start"]), 2), round(float(s["end"]), 2), s["text"]]
+                for s in transcript.get("segments", [])
+            ],
+        }
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        tmp.replace(path)
+
+
+def cached_audio(video_id: str | None, audio_dir: Path = AUDIO_CACHE_DIR) -> Path | None:
+    """Return a previously downloaded audio file for ``video_id`` if present."""
+    if not video_id or not audio_dir.exists():
+        return None
+    for path in audio_dir.glob(f"{video_id}.*"):
+        if path.suffix not in {".part", ".ytdl", ".tmp"}:
+            return path
+    return None
@@ -0,0 +1,148 @@
+"""Staged download → transcribe → summarize pipeline for video ingestion."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable
+
+from utils.transcription import (
+    TranscriptCache,
+    TranscriptionEngine,
+    init_worker_engine,
+    transcribe_file,
+)
+
+DownloadFn = Callable[[str], tuple[Path, dict]]
+FinishFn = Callable[[str, str, dict, dict], Awaitable[int]]
+MetadataFn = Callable[[str], dict]
+
+
+async def run_video_pipeline(
+    entries: Iterable[tuple[str, str]],
+    download: DownloadFn,
+    finish: FinishFn,
+    engine_options: dict,
+    download_workers: int = 4,
+    transcribe_workers: int = 1,
+    summarize_concurrency: int = 4,
+    queue_size: int = 4,
+    transcript_cache: TranscriptCache | None = None,
+    metadata: MetadataFn | None = None,
+) -> list[tuple[str, int, str | None]]:
+    """Run videos through overlapping, bounded stages.
+
+    Downloads run in a thread pool, Whisper runs in a process pool (one model
+    per worker process) and ``finish`` (summarize + write) runs on the event
+    loop under a semaphore. Stages are joined by bounded queues, so a slow
+    stage applies back-pressure instead of piling up audio files.
+
+    ``entries`` are ``(url, query_term)`` pairs. ``transcribe_workers=0``
+    transcribes in-process on a single thread (e.g. to share one GPU model).
+    With a ``transcript_cache`` and a ``metadata`` lookup, videos whose
+    transcript is cached skip download and Whisper and go straight to
+    ``finish``; fresh transcripts are written back to the cache.
+    Returns ``(url, clip_count, error)`` per entry in input order.
+    """
+    entries = list(entries)
+    loop = asyncio.get_running_loop()
+    results: dict[str, tuple[int, str | None]] = {}
+    cache_options = TranscriptionEngine(**engine_options).options
+
+    download_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    transcribe_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    summarize_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    summarize_sem = asyncio.Semaphore(summarize_concurrency)
+
+    download_pool = ThreadPoolExecutor(max_workers=download_workers)
+    transcribe_pool: Executor
+    if transcribe_workers > 0:
+        options = dict(engine_options)
+        if not options.get("threads") and transcribe_workers > 1:
+            options["threads"] = max(1, (os.cpu_count() or 1) // transcribe_workers)
+        transcribe_pool = ProcessPoolExecutor(
+            max_workers=transcribe_workers,
+            initializer=init_worker_engine,
+            initargs=(options,),
+        )
+        transcribe = transcribe_file
+    else:
+        transcribe_pool = ThreadPoolExecutor(max_workers=1)
+        transcribe = TranscriptionEngine(**engine_options).transcribe
+
+    async def download_worker() -> None:
+        while True:
+            url, term = await download_q.get()
+            try:
+                if transcript_cache and metadata:
+                    info = await loop.run_in_executor(download_pool, metadata, url)
+                    cached = transcript_cache.get(str(info.get("id")), cache_options)
+                    if cached is not None:
+                        print(f"💾 Using cached transcript for {url}")
+                        await summarize_q.put((url, term, info, cached))
+                        continue
+                audio_path, info = await loop.run_in_executor(download_pool, download, url)
+                print(f"📥 Downloaded {audio_path}")
+            except Exception as e:
+                print(f"❌ Download failed for {url}: {e}")
+                results[url] = (0, str(e))
+            else:
+                await transcribe_q.put((url, term, audio_path, info))
+            finally:
+                download_q.task_done()
+
+    async def transcribe_worker() -> None:
+        while True:
+            url, term, audio_path, info = await transcribe_q.get()
+            try:
+                transcript = await loop.run_in_executor(transcribe_pool, transcribe, audio_path)
+                print(f"📜 Transcription complete for {url}")
+                if transcript_cache and info.get("id"):
+                    transcript_cache.put(str(info["id"]), cache_options, transcript)
+            except Exception as e:
+                print(f"❌ Transcription failed for {url}: {e}")
+                results[url] = (0, str(e))
+            else:
+                await summarize_q.put((url, term, info, transcript))
+            finally:
+                transcribe_q.task_done()
+
+    async def finish_one(url: str, term: str, info: dict, transcript: dict) -> None:
+        try:
+            count = await finish(url, term, info, transcript)
+            results[url] = (count, None)
+        except Exception as e:
+            print(f"❌ Failed to summarize {url}: {e}")
+            results[url] = (0, str(e))
+        finally:
+            summarize_sem.release()
+            summarize_q.task_done()
+
+    async def summarize_dispatcher() -> None:
+        while True:
+            item = await summarize_q.get()
+            await summarize_sem.acquire()
+            asyncio.create_task(finish_one(*item))
+
+    workers = [asyncio.create_task(download_worker()) for _ in range(download_workers)]
+    workers += [
+        asyncio.create_task(transcribe_worker()) for _ in range(max(1, transcribe_workers))
+    ]
+    workers.append(asyncio.create_task(summarize_dispatcher()))
+
+    try:
+        for entry in entries:
+            await download_q.put(entry)
+        await download_q.join()
+        await transcribe_q.join()
+        await summarize_q.join()
+    finally:
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        download_pool.shutdown(wait=False, cancel_futures=True)
+        transcribe_pool.shutdown(wait=False, cancel_futures=True)
+
+    return [(url, *results.get(url, (0, "not processed"))) for url, _ in entries]